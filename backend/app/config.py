@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -7,7 +10,168 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     base_url: str = "http://localhost:3000"
 
+    # SQLite profile
+    # default: one pooled engine, rollback journal
+    # performance: WAL + tuned pragmas; all writes go through a single
+    # connection while reads use a separate pool
+    sqlite_profile: Literal["default", "performance"] = "default"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_read_pool_size: int = 5
+
+    # Server database pool (PostgreSQL)
+    database_pool_size: int = 10
+    database_max_overflow: int = 10
+    database_pool_timeout_s: float = 30.0
+    database_pool_pre_ping: bool = True
+    database_pool_recycle_s: int = 30 * 60
+    # asyncpg prepared-statement cache per connection; set 0 behind PgBouncer
+    # in transaction pooling mode
+    postgres_statement_cache_size: int = 100
+
+    # Shared outbound HTTP client (Google APIs)
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_s: float = 30.0
+    http_connect_timeout_s: float = 5.0
+    geocoding_timeout_s: float = 5.0
+    routing_timeout_s: float = 10.0
+    places_timeout_s: float = 10.0
+
+    # Road-snap cache (quantized pin -> snapped point)
+    snap_cache_precision_m: float = 10.0
+    snap_cache_max_entries: int = 10_000
+    snap_cache_ttl_s: int = 30 * 24 * 60 * 60
+    snap_cache_persist: bool = True
+
+    # Places searchNearby cache (geohash cell + radius -> raw places)
+    places_cache_enabled: bool = True
+    places_cache_geohash_precision: int = 7
+    places_cache_ttl_s: int = 24 * 60 * 60
+    places_cache_max_entries: int = 2_000
+    places_cache_persist: bool = True
+    # iterative: widen 800 -> 2700 m one request at a time
+    # single: one MAX_SEARCH_RADIUS request ranked by distance (a popularity-ranked
+    #   page of 20 would mostly miss the inner radii), widening reproduced locally
+    # concurrent: all radii requested at once
+    places_search_mode: Literal["iterative", "single", "concurrent"] = "iterative"
+
+    # Compute pipeline stage timeouts
+    midpoint_stage_timeout_s: float = 30.0
+    places_stage_timeout_s: float = 30.0
+    intelligence_stage_timeout_s: float = 60.0
+
+    # Background compute jobs
+    # memory: in-process asyncio queue (single worker process)
+    # database: compute_jobs table shared by every uvicorn worker
+    compute_job_backend: Literal["memory", "database"] = "memory"
+    compute_job_concurrency: int = 4
+    compute_job_queue_size: int = 100
+    compute_job_poll_interval_s: float = 1.0
+    compute_job_stale_after_s: int = 5 * 60
+    compute_job_max_attempts: int = 2
+    # On shutdown, how long running (and, for memory, queued) jobs get to finish
+    # before they are cancelled and their sessions reset
+    compute_job_shutdown_timeout_s: float = 20.0
+
+    # Session update push (SSE)
+    # memory: in-process pub/sub (single worker process)
+    # database: session_events table polled by every uvicorn worker
+    event_broker_backend: Literal["memory", "database"] = "memory"
+    event_poll_interval_s: float = 0.5
+    # Events inserted this recently are re-scanned on every poll, so ones that
+    # commit late (out of id order) are still delivered; covers commit delay
+    # and clock skew between workers
+    event_poll_lookback_s: int = 10
+    # Events older than this are deleted, checked every tenth of the period
+    event_retention_s: int = 5 * 60
+    sse_keepalive_s: float = 15.0
+
+    # Per-client rate limits (sliding window) on create / join / compute
+    # memory: counters per worker process; database: shared rate_limit_counters table
+    rate_limit_backend: Literal["memory", "database"] = "memory"
+    rate_limit_evict_interval_s: float = 60.0
+    # Peers (addresses or CIDR ranges, comma-separated) whose X-Forwarded-For /
+    # X-Real-IP headers are believed, e.g. the Next.js frontend; anyone else
+    # is limited by their own connection address. Only list the frontend when
+    # a reverse proxy that overwrites X-Forwarded-For sits in front of it, or
+    # browsers can choose their own address.
+    rate_limit_trusted_proxies: str = "127.0.0.1,::1"
+    rate_limit_create_limit: int = 10
+    rate_limit_create_window_s: int = 60 * 60
+    rate_limit_join_limit: int = 30
+    rate_limit_join_window_s: int = 10 * 60
+    rate_limit_compute_limit: int = 20
+    rate_limit_compute_window_s: int = 10 * 60
+
+    # Encoded GET /api/sessions/{id} payloads, keyed by (session id, version)
+    session_payload_cache_max_entries: int = 1_000
+    session_payload_cache_ttl_s: int = 5 * 60
+
+    # Expired-session reaper: deletes sessions (and their venues, votes, jobs
+    # and events) once they are past SESSION_TTL_S plus the grace period,
+    # during which reads still answer 410 rather than 404. It also deletes
+    # persistent cache rows past their TTL
+    session_reaper_enabled: bool = True
+    session_reaper_dry_run: bool = False
+    session_reaper_interval_s: float = 10 * 60
+    session_reaper_grace_s: int = 60 * 60
+    session_reaper_batch_size: int = 200
+    session_reaper_max_batches: int = 50
+    # SQLite only: VACUUM + ANALYZE after deletions, at most this often
+    sqlite_maintenance_interval_s: int = 24 * 60 * 60
+
+    # Fair midpoint search
+    # line_search: damped walk toward the slower user, one Distance Matrix call per step
+    # grid: score a grid of candidates around the geographic midpoint in one call
+    # local: rank many candidates on the offline transit graph, confirm the best with Google
+    midpoint_engine: Literal["line_search", "grid", "local"] = "grid"
+    # minimax: minimise the longer trip; balance: minimise the difference
+    midpoint_objective: Literal["minimax", "balance"] = "minimax"
+    midpoint_grid_size: int = 5
+    midpoint_local_grid_size: int = 30
+
+    # Offline transit graph (GTFS directory or .zip) for midpoint_engine=local
+    transit_gtfs_path: str = ""
+    transit_walk_speed_mps: float = 1.3
+    transit_walk_radius_m: float = 400.0
+    transit_access_radius_m: float = 1000.0
+    transit_boarding_penalty_s: float = 300.0
+    transit_transfer_penalty_s: float = 180.0
+    transit_max_travel_s: float = 3 * 60 * 60
+
+    # Travel-time cache (origin cell, destination cell, mode, time-of-day bucket)
+    travel_time_cache_enabled: bool = True
+    travel_time_cache_precision_m: float = 100.0
+    travel_time_cache_bucket_minutes: int = 60
+    travel_time_cache_ttl_s: int = 7 * 24 * 60 * 60
+    travel_time_cache_max_entries: int = 50_000
+    travel_time_cache_persist: bool = True
+
+    # How AI stages split venues into LLM requests
+    # batch: one request for all venues; chunked: llm_chunk_size venues per
+    # request; per_venue: one request each. Requests run concurrently, at most
+    # llm_max_concurrency at a time, and a failure only retries its own venues
+    llm_execution_strategy: Literal["batch", "chunked", "per_venue"] = "batch"
+    llm_chunk_size: int = 3
+    llm_max_concurrency: int = 4
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
+    @field_validator("database_url")
+    @classmethod
+    def _use_async_driver(cls, url: str) -> str:
+        # Accept the plain URLs most hosts hand out and pick the async driver
+        for prefix, driver in (
+            ("postgres://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(prefix):
+                return driver + url.removeprefix(prefix)
+        return url
+
 
 settings = Settings()
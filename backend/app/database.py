@@ -1,17 +1,124 @@
 from collections.abc import AsyncGenerator
+from pathlib import Path
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session as OrmSession
 
 from app.config import settings
-from app.models import Base
 
-engine = create_async_engine(settings.database_url, echo=False)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
 
 
-async def create_tables() -> None:
+def _is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}")
+    cursor.close()
+
+
+def _tuned_sqlite_engine(**kwargs) -> AsyncEngine:
+    tuned = create_async_engine(settings.database_url, echo=False, **kwargs)
+    event.listen(tuned.sync_engine, "connect", _apply_sqlite_pragmas)
+    return tuned
+
+
+if settings.sqlite_profile == "performance" and _is_file_sqlite(settings.database_url):
+    # SQLite allows one writer at a time: queue writers on a single pooled
+    # connection instead of letting them spin on the file lock, and let WAL
+    # readers proceed from their own pool without blocking on the writer
+    engine = _tuned_sqlite_engine(pool_size=1, max_overflow=0)
+    read_engine = _tuned_sqlite_engine(pool_size=settings.sqlite_read_pool_size, max_overflow=0)
+elif settings.database_url.startswith("postgresql"):
+    engine = create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout_s,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        pool_recycle=settings.database_pool_recycle_s,
+        # SQLAlchemy's own prepared-statement cache, then asyncpg's
+        connect_args={
+            "prepared_statement_cache_size": settings.postgres_statement_cache_size,
+            "statement_cache_size": settings.postgres_statement_cache_size,
+        },
+    )
+    read_engine = engine
+else:
+    engine = create_async_engine(settings.database_url, echo=False)
+    read_engine = engine
+
+
+class RoutingSession(OrmSession):
+    """
+    Sends flushes and INSERT/UPDATE/DELETE statements to the write engine and
+    other reads to the read engine. Once a transaction has written, its later
+    reads stay on the write connection so they see its own changes.
+    """
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:
+        if self._writing or self._flushing or (clause is not None and clause.is_dml):
+            self._writing = True
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: RoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session._writing = False
+
+
+if read_engine is engine:
+    async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+else:
+    async_session_factory = async_sessionmaker(
+        sync_session_class=RoutingSession, expire_on_commit=False
+    )
+
+
+def dialect_insert(db: AsyncSession):
+    """insert() for the session's dialect, which adds on_conflict_do_nothing/do_update."""
+    return {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[db.get_bind().dialect.name]
+
+
+def _upgrade(connection: Connection) -> None:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+async def run_migrations() -> None:
+    """Bring the schema up to the latest Alembic revision."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+        await conn.run_sync(_upgrade)
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -1,21 +1,50 @@
+import asyncio
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import create_tables
-from app.routers import sessions, join, compute, vote
+from app.database import dispose_engines, run_migrations
+from app.responses import ORJSONResponse
+from app.routers import sessions, join, compute, vote, metrics
+from app.services.compute_pipeline import run_compute
+from app.services.events import start_broker, stop_broker
+from app.services.http_client import close_http_client, open_http_client
+from app.services.jobs import start_job_queue, stop_job_queue
+from app.services.llm_client import close_anthropic_client
+from app.services.rate_limit import RateLimitMiddleware, start_rate_limiter, stop_rate_limiter
+from app.services.reaper import start_reaper, stop_reaper
+from app.services.transit_graph import load_transit_graph
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
-    await create_tables()
-    yield
-
-
-app = FastAPI(title="Halfway Meetup API", lifespan=lifespan)
+    await run_migrations()
+    await open_http_client()
+    await asyncio.to_thread(load_transit_graph)
+    await start_rate_limiter()
+    await start_broker()
+    await start_job_queue(run_compute)
+    await start_reaper()
+    try:
+        yield
+    finally:
+        await stop_reaper()
+        await stop_job_queue()
+        await stop_broker()
+        await stop_rate_limiter()
+        await close_anthropic_client()
+        await close_http_client()
+        await dispose_engines()
+
+
+app = FastAPI(
+    title="Halfway Meetup API", lifespan=lifespan, default_response_class=ORJSONResponse
+)
 
+app.add_middleware(RateLimitMiddleware)
+# Added last so it wraps everything, including rate-limit 429s
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -28,3 +57,4 @@ app.include_router(sessions.router)
 app.include_router(join.router)
 app.include_router(compute.router)
 app.include_router(vote.router)
+app.include_router(metrics.router)
@@ -1,5 +1,12 @@
-from sqlalchemy import String, Float, Integer, Text, ForeignKey
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from typing import Any
+
+from sqlalchemy import JSON, String, Float, Integer, BigInteger, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+# Native JSON column: JSONB on PostgreSQL, JSON text on SQLite. Python None
+# is stored as SQL NULL rather than the JSON literal null.
+JSONColumn = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
 
 
 class Base(DeclarativeBase):
@@ -25,16 +32,28 @@ class Session(Base):
     winner_venue_id: Mapped[str | None] = mapped_column(String, nullable=True)
     pin_code: Mapped[str | None] = mapped_column(String, nullable=True)
     warning: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
-    updated_at: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    updated_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Bumped on every change to the session or its votes; part of the ETag
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
+    # lazy="raise": async code must load these explicitly (see session_view.load_session_graph)
+    venues: Mapped[list["Venue"]] = relationship(
+        back_populates="session", lazy="raise", order_by="Venue.rank"
+    )
+    votes: Mapped[list["Vote"]] = relationship(back_populates="session", lazy="raise")
 
-class Venue(Base):
-    __tablename__ = "venues"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
-    session_id: Mapped[str] = mapped_column(String, ForeignKey("sessions.id"), nullable=False)
-    google_place_id: Mapped[str] = mapped_column(String, nullable=False)
+class Place(Base):
+    """
+    Catalog of Google places shared by every session: Places data is
+    refreshed on each compute, and the AI fields are kept until their
+    inputs change (intelligence_key).
+    """
+
+    __tablename__ = "places"
+
+    google_place_id: Mapped[str] = mapped_column(String, primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     address: Mapped[str | None] = mapped_column(Text, nullable=True)
     lat: Mapped[float] = mapped_column(Float, nullable=False)
@@ -43,27 +62,119 @@ class Venue(Base):
     user_rating_count: Mapped[int] = mapped_column(Integer, nullable=False)
     price_level: Mapped[str | None] = mapped_column(String, nullable=True)
     google_maps_uri: Mapped[str | None] = mapped_column(Text, nullable=True)
-    types: Mapped[str | None] = mapped_column(Text, nullable=True)
+    types: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
+    editorial_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    raw_reviews_cache: Mapped[list[dict[str, Any]] | None] = mapped_column(JSONColumn, nullable=True)
+    updated_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    cuisine_tags: Mapped[str | None] = mapped_column(Text, nullable=True)
-    vibe_tags: Mapped[str | None] = mapped_column(Text, nullable=True)
-    best_for: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cuisine_tags: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
+    vibe_tags: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
+    best_for: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
     signature_dish: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Review analysis fields
-    review_sentiment: Mapped[str | None] = mapped_column(Text, nullable=True)
-    standout_dishes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    review_sentiment: Mapped[dict[str, float] | None] = mapped_column(JSONColumn, nullable=True)
+    standout_dishes: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
     review_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
-    review_highlights: Mapped[str | None] = mapped_column(Text, nullable=True)
-    editorial_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw_reviews_cache: Mapped[str | None] = mapped_column(Text, nullable=True)
+    review_highlights: Mapped[list[str] | None] = mapped_column(JSONColumn, nullable=True)
+
+    # Hash of the prompt and inputs the AI fields were generated from
+    intelligence_key: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class Venue(Base):
+    """A place shortlisted for one session; the place's data lives in the catalog."""
+
+    __tablename__ = "venues"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("sessions.id"), nullable=False, index=True
+    )
+    place_id: Mapped[str] = mapped_column(
+        String, ForeignKey("places.google_place_id"), nullable=False, index=True
+    )
+    # Position in the session's venue list (best match first)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    session: Mapped[Session] = relationship(back_populates="venues", lazy="raise")
+    place: Mapped[Place] = relationship(lazy="raise")
 
 
 class Vote(Base):
     __tablename__ = "votes"
+    # One vote per voter per session; also serves lookups by session_id alone
+    __table_args__ = (Index("uq_votes_session_id_voter", "session_id", "voter", unique=True),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     session_id: Mapped[str] = mapped_column(String, ForeignKey("sessions.id"), nullable=False)
     venue_id: Mapped[str] = mapped_column(String, ForeignKey("venues.id"), nullable=False)
     voter: Mapped[str] = mapped_column(String, nullable=False)
-    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    session: Mapped[Session] = relationship(back_populates="votes", lazy="raise")
+
+
+class SnapCache(Base):
+    __tablename__ = "snap_cache"
+
+    cell: Mapped[str] = mapped_column(String, primary_key=True)
+    lat: Mapped[float] = mapped_column(Float, nullable=False)
+    lng: Mapped[float] = mapped_column(Float, nullable=False)
+    address: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class PlaceSearchCache(Base):
+    __tablename__ = "place_search_cache"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    geohash: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    radius: Mapped[float] = mapped_column(Float, nullable=False)
+    rank_preference: Mapped[str | None] = mapped_column(String, nullable=True)
+    center_lat: Mapped[float] = mapped_column(Float, nullable=False)
+    center_lng: Mapped[float] = mapped_column(Float, nullable=False)
+    places: Mapped[str] = mapped_column(Text, nullable=False)
+    fetched_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class ComputeJob(Base):
+    __tablename__ = "compute_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("sessions.id"), nullable=False, index=True
+    )
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued", index=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    started_at: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    finished_at: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+
+class TravelTimeCache(Base):
+    __tablename__ = "travel_time_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class SessionEvent(Base):
+    __tablename__ = "session_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    # "<policy>:<client>" and the fixed window index it counts for
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    window: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
@@ -1,4 +1,3 @@
-import json
 import logging
 import time
 
@@ -8,21 +7,18 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import Session, Venue
+from app.models import Session
 from app.schemas import ComputeResponse
-from app.services.midpoint import find_fair_midpoint, geographic_midpoint
-from app.services.places import search_venues
-from app.services.session_utils import generate_id
-from app.services.venue_enrichment import enrich_venues
+from app.services.events import publish_session
+from app.services.jobs import QueueFullError, get_job_queue
+from app.services.session_utils import SESSION_TTL_S, touch_session
 
 logger = logging.getLogger(__name__)
 
-SESSION_TTL_S = 24 * 60 * 60
-
 router = APIRouter()
 
 
-@router.post("/api/sessions/{session_id}/compute", response_model=None)
+@router.post("/api/sessions/{session_id}/compute", response_model=None, status_code=202)
 async def compute_midpoint(
     session_id: str,
     db: AsyncSession = Depends(get_db),
@@ -51,130 +47,32 @@ async def compute_midpoint(
             )
 
         session.status = "computing"
-        session.updated_at = int(time.time())
+        touch_session(session)
         await db.commit()
 
-        location_a = {"lat": session.user_a_lat, "lng": session.user_a_lng}
-        location_b = {"lat": session.user_b_lat, "lng": session.user_b_lng}
-
-        # Stage 1: Find fair midpoint
-        midpoint = geographic_midpoint(location_a, location_b)
-        travel_time_a: int | None = None
-        travel_time_b: int | None = None
-        warning: str | None = None
-
-        try:
-            mp_result = await find_fair_midpoint(location_a, location_b)
-            midpoint = mp_result.midpoint
-            travel_time_a = mp_result.travel_time_a
-            travel_time_b = mp_result.travel_time_b
-            warning = mp_result.warning
-        except Exception as mp_err:
-            logger.error("Midpoint computation failed, using geographic fallback: %s", mp_err)
-            warning = "Could not compute public transport times. Using geographic midpoint."
-
-        # Stage 2: Search for venues
-        raw_venues: list[dict] = []
-        try:
-            raw_venues = await search_venues(midpoint)
-        except Exception as venue_err:
-            logger.error("Venue search failed: %s", venue_err)
-
-        # Stage 3: Analyze reviews with AI
-        review_analyses: dict[str, dict] = {}
         try:
-            from app.services.review_analysis import analyze_reviews_with_ai
-            review_analyses = await analyze_reviews_with_ai(raw_venues)
-        except Exception as review_err:
-            logger.warning("Review analysis failed, using basic enrichment: %s", review_err)
-
-        # Stage 4: Enrich venues with AI (incorporating review data)
-        enrichments: dict[str, dict] = {}
-        try:
-            enrichments = await enrich_venues(raw_venues, review_analyses)
-        except Exception as enrich_err:
-            logger.error("Venue enrichment failed: %s", enrich_err)
-
-        # Store venues in database
-        for venue in raw_venues:
-            name = venue.get("displayName", {}).get("text", "")
-            enrichment = enrichments.get(name)
-            review_analysis = review_analyses.get(name)
-
-            # Extract and cache reviews (top 5)
-            raw_reviews = venue.get("reviews", [])[:5]
-            reviews_json = json.dumps(raw_reviews) if raw_reviews else None
-
-            db.add(
-                Venue(
-                    id=generate_id(),
-                    session_id=session_id,
-                    google_place_id=venue.get("id", ""),
-                    name=name,
-                    address=venue.get("formattedAddress"),
-                    lat=venue["location"]["latitude"],
-                    lng=venue["location"]["longitude"],
-                    rating=venue.get("rating") or 0,
-                    user_rating_count=venue.get("userRatingCount") or 0,
-                    price_level=venue.get("priceLevel"),
-                    google_maps_uri=venue.get("googleMapsUri"),
-                    types=json.dumps(venue.get("types")) if venue.get("types") else None,
-                    description=enrichment.get("description") if enrichment else None,
-                    cuisine_tags=(
-                        json.dumps(enrichment["cuisineTags"]) if enrichment and enrichment.get("cuisineTags") else None
-                    ),
-                    vibe_tags=(
-                        json.dumps(enrichment["vibeTags"]) if enrichment and enrichment.get("vibeTags") else None
-                    ),
-                    best_for=(
-                        json.dumps(enrichment["bestFor"]) if enrichment and enrichment.get("bestFor") else None
-                    ),
-                    signature_dish=enrichment.get("signatureDish") if enrichment else None,
-                    # Review analysis fields
-                    review_sentiment=(
-                        json.dumps(review_analysis["sentiment"])
-                        if review_analysis and review_analysis.get("sentiment")
-                        else None
-                    ),
-                    standout_dishes=(
-                        json.dumps(review_analysis["standoutDishes"])
-                        if review_analysis and review_analysis.get("standoutDishes")
-                        else None
-                    ),
-                    review_summary=review_analysis.get("reviewSummary") if review_analysis else None,
-                    review_highlights=(
-                        json.dumps(review_analysis["highlights"])
-                        if review_analysis and review_analysis.get("highlights")
-                        else None
-                    ),
-                    editorial_summary=(
-                        venue.get("editorialSummary", {}).get("text") if venue.get("editorialSummary") else None
-                    ),
-                    raw_reviews_cache=reviews_json,
-                )
+            await get_job_queue().enqueue(session_id)
+        except QueueFullError:
+            session.status = "ready_to_compute"
+            touch_session(session)
+            await db.commit()
+            return JSONResponse(
+                {"error": "Too many computations in progress. Try again shortly."},
+                status_code=503,
             )
 
-        # Update session
-        session.midpoint_lat = midpoint["lat"]
-        session.midpoint_lng = midpoint["lng"]
-        session.user_a_travel_time = travel_time_a
-        session.user_b_travel_time = travel_time_b
-        session.warning = warning
-        session.status = "voting"
-        session.updated_at = int(time.time())
-        await db.commit()
-
+        await publish_session(db, session)
         return ComputeResponse(success=True)
 
     except Exception as e:
-        logger.error("Error computing midpoint: %s", e)
-        # Reset status on total failure
+        logger.error("Error starting compute: %s", e)
+        # Reset status if the job could not be queued
         try:
             result = await db.execute(select(Session).where(Session.id == session_id))
             session = result.scalar_one_or_none()
-            if session:
+            if session and session.status == "computing":
                 session.status = "ready_to_compute"
-                session.updated_at = int(time.time())
+                touch_session(session)
                 await db.commit()
         except Exception:
             pass
@@ -9,12 +9,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import Session
 from app.schemas import JoinResponse, JoinSessionRequest
+from app.services.events import publish_session
 from app.services.geocoding import snap_to_road
+from app.services.session_utils import SESSION_TTL_S, touch_session
 
 logger = logging.getLogger(__name__)
 
-SESSION_TTL_S = 24 * 60 * 60
-
 router = APIRouter()
 
 
@@ -61,8 +61,9 @@ async def join_session(
         session.user_b_lng = snap_result["snapped"]["lng"]
         session.user_b_label = snap_result["address"]
         session.status = "ready_to_compute"
-        session.updated_at = int(time.time())
+        touch_session(session)
         await db.commit()
+        await publish_session(db, session)
 
         return JoinResponse(success=True)
     except Exception as e:
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.services.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/api/metrics")
+async def get_metrics() -> dict:
+    return metrics.snapshot()
@@ -1,48 +1,43 @@
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
-from app.models import Session, Venue, Vote
-from app.schemas import (
-    CreateSessionRequest,
-    CreateSessionResponse,
-    SessionOut,
-    VenueOut,
-    VoteOut,
-)
+from app.models import Session
+from app.schemas import CreateSessionRequest, CreateSessionResponse
+from app.services.events import get_broker
 from app.services.geocoding import snap_to_road
-from app.services.rate_limit import check_rate_limit
-from app.services.session_utils import generate_pin_code, generate_session_id, get_share_url
+from app.services.session_utils import (
+    SESSION_TTL_S,
+    generate_pin_code,
+    generate_session_id,
+    get_share_url,
+    session_etag,
+)
+from app.services.session_view import (
+    cached_session_payload,
+    load_session_graph,
+    session_payload,
+)
 
 logger = logging.getLogger(__name__)
 
-SESSION_TTL_S = 24 * 60 * 60  # 24 hours in seconds
-
 router = APIRouter()
 
 
 @router.post("/api/sessions", response_model=None)
 async def create_session(
     body: CreateSessionRequest,
-    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        ip = (
-            (request.headers.get("x-forwarded-for") or "").split(",")[0].strip()
-            or request.headers.get("x-real-ip")
-            or "unknown"
-        )
-        if not check_rate_limit(ip):
-            return JSONResponse(
-                {"error": "Too many sessions. Try again later."}, status_code=429
-            )
-
         if not isinstance(body.lat, (int, float)) or not isinstance(body.lng, (int, float)):
             return JSONResponse(
                 {"error": "lat and lng are required numbers"}, status_code=400
@@ -83,12 +78,15 @@ async def create_session(
         return JSONResponse({"error": "Failed to create session"}, status_code=500)
 
 
-@router.get("/api/sessions/{session_id}")
+@router.get("/api/sessions/{session_id}", response_model=None)
 async def get_session(
     session_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> Response:
     try:
+        # The bare row decides 404/410/304 and the payload cache lookup; the
+        # venue/vote graph is only loaded when the payload must be rebuilt
         result = await db.execute(select(Session).where(Session.id == session_id))
         session = result.scalar_one_or_none()
 
@@ -101,21 +99,73 @@ async def get_session(
                 {"error": "Session expired", "expired": True}, status_code=410
             )
 
-        venues_result = await db.execute(
-            select(Venue).where(Venue.session_id == session_id)
+        etag = session_etag(session)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+        payload = cached_session_payload(session.id, session.version)
+        if payload is None:
+            session = await load_session_graph(db, session_id)
+            if not session:
+                return JSONResponse({"error": "Session not found"}, status_code=404)
+            etag = session_etag(session)
+            payload = session_payload(session)
+
+        return Response(
+            payload,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
         )
-        session_venues = venues_result.scalars().all()
+    except Exception as e:
+        logger.error("Error fetching session: %s", e)
+        return JSONResponse({"error": "Failed to fetch session"}, status_code=500)
 
-        votes_result = await db.execute(
-            select(Vote).where(Vote.session_id == session_id)
-        )
-        session_votes = votes_result.scalars().all()
 
-        out = SessionOut.model_validate(session)
-        out.venues = [VenueOut.model_validate(v) for v in session_venues]
-        out.votes = [VoteOut.model_validate(v) for v in session_votes]
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
 
-        return JSONResponse(out.model_dump(by_alias=True))
+
+@router.get("/api/sessions/{session_id}/events", response_model=None)
+async def stream_session(
+    session_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-Sent Events stream: the current session state, then every committed change."""
+    try:
+        session = await load_session_graph(db, session_id)
+
+        if not session:
+            return JSONResponse({"error": "Session not found"}, status_code=404)
+
+        age = int(time.time()) - session.created_at
+        if age > SESSION_TTL_S:
+            return JSONResponse(
+                {"error": "Session expired", "expired": True}, status_code=410
+            )
+
+        initial = session_payload(session).decode()
+        # Release the pooled connection before the stream starts idling
+        await db.close()
     except Exception as e:
-        logger.error("Error fetching session: %s", e)
+        logger.error("Error opening session stream: %s", e)
         return JSONResponse({"error": "Failed to fetch session"}, status_code=500)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async with get_broker().subscribe(session_id) as updates:
+            yield _sse("session", initial)
+            while True:
+                try:
+                    payload = await asyncio.wait_for(updates.get(), settings.sse_keepalive_s)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse("session", payload)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
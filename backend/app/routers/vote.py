@@ -7,15 +7,15 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Session, Venue, Vote
+from app.database import dialect_insert, get_db
+from app.models import Vote
 from app.schemas import VoteRequest, VoteResponse
-from app.services.session_utils import generate_id
+from app.services.events import publish_session
+from app.services.session_utils import SESSION_TTL_S, generate_id, touch_session
+from app.services.session_view import load_session_graph
 
 logger = logging.getLogger(__name__)
 
-SESSION_TTL_S = 24 * 60 * 60
-
 router = APIRouter()
 
 
@@ -36,8 +36,7 @@ async def submit_vote(
                 {"error": "voter must be user_a or user_b"}, status_code=400
             )
 
-        result = await db.execute(select(Session).where(Session.id == session_id))
-        session = result.scalar_one_or_none()
+        session = await load_session_graph(db, session_id)
 
         if not session:
             return JSONResponse({"error": "Session not found"}, status_code=404)
@@ -54,44 +53,44 @@ async def submit_vote(
             )
 
         # Validate venue exists for this session
-        venue_result = await db.execute(
-            select(Venue).where(Venue.session_id == session_id, Venue.id == body.venueId)
-        )
-        if not venue_result.scalar_one_or_none():
+        if not any(v.id == body.venueId for v in session.venues):
             return JSONResponse(
                 {"error": "Venue not found in this session"}, status_code=400
             )
 
-        # Check if voter already voted
-        existing = await db.execute(
-            select(Vote).where(Vote.session_id == session_id, Vote.voter == body.voter)
-        )
-        if existing.scalar_one_or_none():
-            return JSONResponse({"error": "You have already voted"}, status_code=400)
-
-        # Insert vote
-        db.add(
-            Vote(
+        # Insert-or-conflict on (session_id, voter): a concurrent duplicate
+        # loses here instead of slipping past a separate SELECT
+        insert = dialect_insert(db)
+        result = await db.execute(
+            insert(Vote)
+            .values(
                 id=generate_id(),
                 session_id=session_id,
                 venue_id=body.venueId,
                 voter=body.voter,
                 created_at=int(time.time()),
             )
+            .on_conflict_do_nothing(index_elements=["session_id", "voter"])
         )
-        await db.commit()
+        if result.rowcount == 0:
+            await db.rollback()
+            return JSONResponse({"error": "You have already voted"}, status_code=400)
 
-        # Check if both votes are in
-        all_votes_result = await db.execute(
-            select(Vote).where(Vote.session_id == session_id)
-        )
-        all_votes = all_votes_result.scalars().all()
+        # Bump the session version so its ETag changes
+        touch_session(session)
 
+        # Decide the winner from the votes as of this insert (the other voter
+        # may have committed since the graph was loaded), in the same transaction
+        all_votes = (
+            await db.scalars(select(Vote).where(Vote.session_id == session_id))
+        ).all()
+        winner_id: str | None = None
         if len(all_votes) == 2:
             vote_a = next((v for v in all_votes if v.voter == "user_a"), None)
             vote_b = next((v for v in all_votes if v.voter == "user_b"), None)
 
             if not vote_a or not vote_b:
+                await db.rollback()
                 return JSONResponse({"error": "Invalid vote data"}, status_code=500)
 
             if vote_a.venue_id == vote_b.venue_id:
@@ -101,11 +100,12 @@ async def submit_vote(
 
             session.winner_venue_id = winner_id
             session.status = "completed"
-            session.updated_at = int(time.time())
-            await db.commit()
 
-            return VoteResponse(all_votes_in=True, winner_id=winner_id)
+        await db.commit()
+        await publish_session(db, session)
 
+        if winner_id:
+            return VoteResponse(all_votes_in=True, winner_id=winner_id)
         return VoteResponse(all_votes_in=False)
 
     except Exception as e:
@@ -70,18 +70,18 @@ class VenueOut(CamelModel):
     user_rating_count: int
     price_level: str | None
     google_maps_uri: str | None
-    types: str | None
+    types: list[str] | None
     description: str | None
-    cuisine_tags: str | None
-    vibe_tags: str | None
-    best_for: str | None
+    cuisine_tags: list[str] | None
+    vibe_tags: list[str] | None
+    best_for: list[str] | None
     signature_dish: str | None
 
     # Review analysis fields
-    review_sentiment: str | None
-    standout_dishes: str | None
+    review_sentiment: dict[str, float] | None
+    standout_dishes: list[str] | None
     review_summary: str | None
-    review_highlights: str | None
+    review_highlights: list[str] | None
     editorial_summary: str | None
 
 
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+from app.services.metrics import metrics
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded in-memory LRU cache with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, name: str, max_entries: int, ttl_s: float) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: str) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            metrics.incr(f"{self.name}.miss")
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._data[key]
+            metrics.incr(f"{self.name}.miss")
+            return None
+
+        self._data.move_to_end(key)
+        metrics.incr(f"{self.name}.hit")
+        return value
+
+    def set(self, key: str, value: V, ttl_s: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_s if ttl_s is None else ttl_s)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            metrics.incr(f"{self.name}.evicted")
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Collection
+from typing import Any, TypeVar
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory, dialect_insert
+from app.models import Place, Session, Venue
+from app.services.events import publish_session, publish_sessions
+from app.services.metrics import metrics
+from app.services.midpoint import find_fair_midpoint, geographic_midpoint
+from app.services.places import search_venues
+from app.services.session_utils import SESSION_TTL_S, generate_id, touch_session
+from app.services.venue_intelligence import analyze_venues, intelligence_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def _run_stage(name: str, stage: Awaitable[T], timeout_s: float, default: T) -> T:
+    """Await one pipeline stage under a timeout, recording its duration; failures yield default."""
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(stage, timeout_s)
+    except TimeoutError:
+        metrics.incr(f"compute.{name}.timeout")
+        logger.error("Compute stage %s timed out after %ss", name, timeout_s)
+    except Exception as e:
+        metrics.incr(f"compute.{name}.error")
+        logger.error("Compute stage %s failed: %s", name, e)
+    finally:
+        metrics.observe(f"compute.{name}", time.perf_counter() - started)
+    return default
+
+
+def _place_row(venue: dict[str, Any], now: int) -> dict[str, Any]:
+    """Catalog values for one place from Places; AI fields are filled in as they stream in."""
+    return {
+        "google_place_id": venue["id"],
+        "name": venue.get("displayName", {}).get("text", ""),
+        "address": venue.get("formattedAddress"),
+        "lat": venue["location"]["latitude"],
+        "lng": venue["location"]["longitude"],
+        "rating": venue.get("rating") or 0,
+        "user_rating_count": venue.get("userRatingCount") or 0,
+        "price_level": venue.get("priceLevel"),
+        "google_maps_uri": venue.get("googleMapsUri"),
+        "types": venue.get("types") or None,
+        "editorial_summary": (
+            venue.get("editorialSummary", {}).get("text") if venue.get("editorialSummary") else None
+        ),
+        # Top 5 reviews
+        "raw_reviews_cache": venue.get("reviews", [])[:5] or None,
+        "updated_at": now,
+    }
+
+
+def _enrichment_values(enrichment: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "description": enrichment.get("description"),
+        "cuisine_tags": enrichment.get("cuisineTags") or None,
+        "vibe_tags": enrichment.get("vibeTags") or None,
+        "best_for": enrichment.get("bestFor") or None,
+        "signature_dish": enrichment.get("signatureDish"),
+    }
+
+
+def _review_values(review_analysis: dict[str, Any] | None) -> dict[str, Any]:
+    review_analysis = review_analysis or {}
+    return {
+        "review_sentiment": review_analysis.get("sentiment") or None,
+        "standout_dishes": review_analysis.get("standoutDishes") or None,
+        "review_summary": review_analysis.get("reviewSummary"),
+        "review_highlights": review_analysis.get("highlights") or None,
+    }
+
+
+async def _touch_sharing_sessions(
+    db: AsyncSession, place_ids: Collection[str], session_id: str
+) -> list[str]:
+    """
+    Bump the version of the other sessions being voted on that shortlist any
+    of place_ids, so their ETags and cached payloads pick up the changed
+    catalog rows. Returns their ids, to publish once committed.
+    """
+    now = int(time.time())
+    sharing = (
+        await db.scalars(
+            select(Venue.session_id)
+            .distinct()
+            .join(Session, Session.id == Venue.session_id)
+            .where(
+                Venue.place_id.in_(place_ids),
+                Venue.session_id != session_id,
+                Session.status == "voting",
+                Session.created_at >= now - SESSION_TTL_S,
+            )
+        )
+    ).all()
+    if sharing:
+        await db.execute(
+            update(Session)
+            .where(Session.id.in_(sharing))
+            .values(updated_at=now, version=Session.version + 1)
+        )
+    return list(sharing)
+
+
+async def _reset_session(db: AsyncSession, session_id: str) -> None:
+    """Put a session whose compute did not finish back to ready_to_compute."""
+    await db.rollback()
+    try:
+        result = await db.execute(select(Session).where(Session.id == session_id))
+        session = result.scalar_one_or_none()
+        if session:
+            # Drop the shortlist stored before the failure so a retry starts clean;
+            # the catalog rows stay for reuse
+            await db.execute(delete(Venue).where(Venue.session_id == session_id))
+            session.status = "ready_to_compute"
+            touch_session(session)
+            await db.commit()
+            await publish_session(db, session)
+    except Exception:
+        pass
+
+
+async def run_compute(session_id: str) -> None:
+    """Run the midpoint -> places -> AI pipeline for a session already marked computing."""
+    started = time.perf_counter()
+    async with async_session_factory() as db:
+        try:
+            result = await db.execute(select(Session).where(Session.id == session_id))
+            session = result.scalar_one_or_none()
+
+            if not session or session.status != "computing":
+                logger.warning("Skipping compute job for session %s: not computing", session_id)
+                return
+
+            location_a = {"lat": session.user_a_lat, "lng": session.user_a_lng}
+            location_b = {"lat": session.user_b_lat, "lng": session.user_b_lng}
+
+            # Stage 1: Find fair midpoint
+            midpoint = geographic_midpoint(location_a, location_b)
+            travel_time_a: int | None = None
+            travel_time_b: int | None = None
+            warning: str | None = None
+
+            mp_result = await _run_stage(
+                "midpoint",
+                find_fair_midpoint(location_a, location_b),
+                settings.midpoint_stage_timeout_s,
+                None,
+            )
+            if mp_result:
+                midpoint = mp_result.midpoint
+                travel_time_a = mp_result.travel_time_a
+                travel_time_b = mp_result.travel_time_b
+                warning = mp_result.warning
+            else:
+                warning = "Could not compute public transport times. Using geographic midpoint."
+
+            # Stage 2: Search for venues
+            raw_venues: list[dict] = await _run_stage(
+                "places", search_venues(midpoint), settings.places_stage_timeout_s, []
+            )
+
+            # Places without an id cannot be cataloged; duplicates keep their best rank
+            venues_by_place: dict[str, dict] = {}
+            for venue in raw_venues:
+                if venue.get("id"):
+                    venues_by_place.setdefault(venue["id"], venue)
+
+            # A re-queued job may run after an earlier attempt already stored a shortlist
+            await db.execute(delete(Venue).where(Venue.session_id == session_id))
+
+            # Refresh the catalog's Places data and shortlist the places for this
+            # session, so clients see venues before the AI stage finishes
+            if venues_by_place:
+                now = int(time.time())
+                place_rows = [_place_row(venue, now) for venue in venues_by_place.values()]
+                insert = dialect_insert(db)
+                stmt = insert(Place).values(place_rows)
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["google_place_id"],
+                        set_={
+                            column: stmt.excluded[column]
+                            for column in place_rows[0]
+                            if column != "google_place_id"
+                        },
+                    )
+                )
+                await db.execute(
+                    insert(Venue),
+                    [
+                        {
+                            "id": generate_id(),
+                            "session_id": session_id,
+                            "place_id": place_id,
+                            "rank": rank,
+                        }
+                        for rank, place_id in enumerate(venues_by_place)
+                    ],
+                )
+
+            # AI results stored with the same inputs are reused as they are
+            keys = {place_id: intelligence_key(venue) for place_id, venue in venues_by_place.items()}
+            stored_keys = dict(
+                (
+                    await db.execute(
+                        select(Place.google_place_id, Place.intelligence_key).where(
+                            Place.google_place_id.in_(keys)
+                        )
+                    )
+                ).all()
+            )
+            stale = [venues_by_place[p] for p, key in keys.items() if stored_keys.get(p) != key]
+            metrics.incr("compute.intelligence_reused", len(keys) - len(stale))
+
+            session.midpoint_lat = midpoint["lat"]
+            session.midpoint_lng = midpoint["lng"]
+            session.user_a_travel_time = travel_time_a
+            session.user_b_travel_time = travel_time_b
+            session.warning = warning
+            touch_session(session)
+            await db.commit()
+            await publish_session(db, session)
+
+            # Concurrent LLM requests share this db session, so their per-venue writes take turns
+            write_lock = asyncio.Lock()
+
+            async def apply(place_id: str, result: dict[str, Any]) -> None:
+                values = {
+                    **_enrichment_values(result["enrichment"]),
+                    **_review_values(result["reviewAnalysis"]),
+                    "intelligence_key": keys[place_id],
+                    "updated_at": int(time.time()),
+                }
+                async with write_lock:
+                    await db.execute(
+                        update(Place).where(Place.google_place_id == place_id).values(**values)
+                    )
+                    touch_session(session)
+                    await db.commit()
+                    await publish_session(db, session)
+
+            # Stage 3: Enrichment and review analysis from one prompt; each venue
+            # is committed and published as soon as its result streams in
+            await _run_stage(
+                "intelligence",
+                analyze_venues(stale, on_result=apply),
+                settings.intelligence_stage_timeout_s,
+                {},
+            )
+
+            # Other sessions showing these places see their refreshed Places data
+            # and AI results once, rather than on every streamed result
+            sharing = await _touch_sharing_sessions(db, list(venues_by_place), session_id)
+            session.status = "voting"
+            touch_session(session)
+            await db.commit()
+            await publish_session(db, session)
+            await publish_sessions(db, sharing)
+
+        except asyncio.CancelledError:
+            # Shutdown cancelled the job mid-run; leave the session retryable
+            logger.warning("Compute for session %s cancelled", session_id)
+            metrics.incr("compute.cancelled")
+            await _reset_session(db, session_id)
+            raise
+        except Exception as e:
+            logger.error("Error computing midpoint for session %s: %s", session_id, e)
+            metrics.incr("compute.failed")
+            await _reset_session(db, session_id)
+        finally:
+            metrics.observe("compute.total", time.perf_counter() - started)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models import Session, SessionEvent
+from app.services.metrics import metrics
+from app.services.session_view import load_session_payload
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+class Broker(ABC):
+    """Fans session update payloads out to the SSE streams subscribed to a session."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue[str]]] = {}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: str) -> None: ...
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue[str]]:
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        metrics.incr("events.subscribed")
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def _deliver(self, channel: str, payload: str) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            # Each payload is a full snapshot, so a slow reader only needs the latest
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+            metrics.incr("events.delivered")
+
+
+class InProcessBroker(Broker):
+    async def publish(self, channel: str, payload: str) -> None:
+        self._deliver(channel, payload)
+
+
+class DatabaseBroker(Broker):
+    """
+    Broker backed by the session_events table so every uvicorn worker sees
+    every update: publishers insert a row, and one poller task per process
+    delivers new rows to its local subscribers.
+
+    Ids are assigned at insert but become visible at commit, so a lower id
+    can appear after a higher one was read. Each poll therefore re-scans the
+    last lookback_s seconds of events and skips the ids it already saw; an
+    event older than one already delivered for its session is dropped, since
+    payloads are full snapshots.
+    """
+
+    def __init__(self, poll_interval_s: float, retention_s: int, lookback_s: int) -> None:
+        super().__init__()
+        self._poll_interval_s = poll_interval_s
+        self._retention_s = retention_s
+        self._lookback_s = lookback_s
+        # Expired events are deleted on their own, slower cadence than polls
+        self._prune_interval_s = retention_s / 10
+        self._next_prune = 0.0
+        # Event id -> created_at for every event seen within the lookback window
+        self._seen: dict[int, int] = {}
+        # Session id -> highest event id delivered for it
+        self._latest: dict[str, int] = {}
+        self._poller: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(SessionEvent.id, SessionEvent.session_id, SessionEvent.created_at).where(
+                    SessionEvent.created_at >= int(time.time()) - self._lookback_s
+                )
+            )
+            for event_id, session_id, created_at in result:
+                self._seen[event_id] = created_at
+                self._latest[session_id] = max(event_id, self._latest.get(session_id, 0))
+        self._poller = asyncio.create_task(self._poll_loop(), name="session-events-poller")
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    async def publish(self, channel: str, payload: str) -> None:
+        async with async_session_factory() as db:
+            db.add(SessionEvent(session_id=channel, payload=payload, created_at=int(time.time())))
+            await db.commit()
+
+    async def _poll_once(self) -> None:
+        since = int(time.time()) - self._lookback_s
+        async with async_session_factory() as db:
+            ids = (
+                await db.scalars(select(SessionEvent.id).where(SessionEvent.created_at >= since))
+            ).all()
+            new_ids = [event_id for event_id in ids if event_id not in self._seen]
+            if new_ids:
+                result = await db.execute(
+                    select(SessionEvent)
+                    .where(SessionEvent.id.in_(new_ids))
+                    .order_by(SessionEvent.id)
+                )
+                for event in result.scalars():
+                    self._seen[event.id] = event.created_at
+                    if event.id < self._latest.get(event.session_id, 0):
+                        metrics.incr("events.superseded")
+                        continue
+                    self._latest[event.session_id] = event.id
+                    self._deliver(event.session_id, event.payload)
+
+        self._seen = {i: t for i, t in self._seen.items() if t >= since}
+        self._latest = {s: i for s, i in self._latest.items() if i in self._seen}
+
+    async def _prune(self) -> None:
+        async with async_session_factory() as db:
+            await db.execute(
+                delete(SessionEvent).where(
+                    SessionEvent.created_at < int(time.time()) - self._retention_s
+                )
+            )
+            await db.commit()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.error("Session event poll failed: %s", e)
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + self._prune_interval_s
+                try:
+                    await self._prune()
+                except Exception as e:
+                    logger.error("Session event prune failed: %s", e)
+            await asyncio.sleep(self._poll_interval_s)
+
+
+_broker: Broker | None = None
+
+
+async def start_broker() -> None:
+    global _broker
+    if settings.event_broker_backend == "database":
+        _broker = DatabaseBroker(
+            settings.event_poll_interval_s,
+            settings.event_retention_s,
+            settings.event_poll_lookback_s,
+        )
+    else:
+        _broker = InProcessBroker()
+    await _broker.start()
+
+
+async def stop_broker() -> None:
+    global _broker
+    if _broker is not None:
+        await _broker.stop()
+        _broker = None
+
+
+def get_broker() -> Broker:
+    if _broker is None:
+        raise RuntimeError("Event broker is not running")
+    return _broker
+
+
+async def publish_session(db: AsyncSession, session: Session) -> None:
+    """Push the committed state of a session to its subscribers; never raises."""
+    await publish_sessions(db, [session.id])
+
+
+async def publish_sessions(db: AsyncSession, session_ids: Iterable[str]) -> None:
+    """publish_session for sessions known only by id."""
+    for session_id in session_ids:
+        try:
+            payload = await load_session_payload(db, session_id)
+            if payload is None:
+                continue
+            await get_broker().publish(session_id, payload.decode())
+            metrics.incr("events.published")
+        except Exception as e:
+            logger.warning("Could not publish update for session %s: %s", session_id, e)
@@ -0,0 +1,42 @@
+import math
+
+from app.services.geocoding import LatLng
+
+EARTH_RADIUS_M = 6_371_000
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_m(a: LatLng, b: LatLng) -> float:
+    lat1, lat2 = math.radians(a["lat"]), math.radians(b["lat"])
+    dlat = lat2 - lat1
+    dlng = math.radians(b["lng"] - a["lng"])
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def geohash_encode(point: LatLng, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lng_range, point["lng"]) if even else (lat_range, point["lat"])
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
@@ -1,11 +1,24 @@
+import logging
+import math
+import time
 from typing import TypedDict
 
 import httpx
+from sqlalchemy import select
 
 from app.config import settings
+from app.database import async_session_factory
+from app.models import SnapCache
+from app.services.cache import TTLCache
+from app.services.http_client import get_http_client, upstream_timeout
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 GOOGLE_GEOCODING_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
+METERS_PER_DEGREE = 111_320
+
 
 class LatLng(TypedDict):
     lat: float
@@ -17,15 +30,58 @@ class SnapResult(TypedDict):
     address: str
 
 
-async def snap_to_road(point: LatLng) -> SnapResult | None:
+_snap_cache: TTLCache[SnapResult] = TTLCache(
+    "snap_cache", settings.snap_cache_max_entries, settings.snap_cache_ttl_s
+)
+
+
+def quantize_cell(point: LatLng, precision_m: float) -> str:
+    """Key a point by the ~precision_m grid cell it falls in."""
+    lat_step = precision_m / METERS_PER_DEGREE
+    lng_step = precision_m / (METERS_PER_DEGREE * max(math.cos(math.radians(point["lat"])), 1e-6))
+    return f"{precision_m:g}:{math.floor(point['lat'] / lat_step)}:{math.floor(point['lng'] / lng_step)}"
+
+
+async def _load_persisted_snap(cell: str) -> SnapResult | None:
+    min_created_at = int(time.time()) - settings.snap_cache_ttl_s
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SnapCache).where(SnapCache.cell == cell, SnapCache.created_at >= min_created_at)
+        )
+        row = result.scalar_one_or_none()
+
+    if not row:
+        return None
+    return {"snapped": {"lat": row.lat, "lng": row.lng}, "address": row.address}
+
+
+async def _persist_snap(cell: str, snap: SnapResult) -> None:
+    async with async_session_factory() as db:
+        await db.merge(
+            SnapCache(
+                cell=cell,
+                lat=snap["snapped"]["lat"],
+                lng=snap["snapped"]["lng"],
+                address=snap["address"],
+                created_at=int(time.time()),
+            )
+        )
+        await db.commit()
+
+
+async def _fetch_snap(point: LatLng, client: httpx.AsyncClient | None) -> SnapResult | None:
     params = {
         "latlng": f"{point['lat']},{point['lng']}",
         "result_type": "street_address|route|premise",
         "key": settings.google_places_api_key,
     }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(GOOGLE_GEOCODING_URL, params=params)
+    client = client or get_http_client()
+    resp = await client.get(
+        GOOGLE_GEOCODING_URL,
+        params=params,
+        timeout=upstream_timeout(settings.geocoding_timeout_s),
+    )
 
     if resp.status_code != 200:
         return None
@@ -45,3 +101,37 @@ async def snap_to_road(point: LatLng) -> SnapResult | None:
         "snapped": {"lat": location["lat"], "lng": location["lng"]},
         "address": result["formatted_address"],
     }
+
+
+async def snap_to_road(
+    point: LatLng, client: httpx.AsyncClient | None = None
+) -> SnapResult | None:
+    cell = quantize_cell(point, settings.snap_cache_precision_m)
+
+    cached = _snap_cache.get(cell)
+    if cached:
+        return cached
+
+    if settings.snap_cache_persist:
+        try:
+            cached = await _load_persisted_snap(cell)
+        except Exception as e:
+            logger.warning("Snap cache lookup failed: %s", e)
+        if cached:
+            metrics.incr("snap_cache.db_hit")
+            _snap_cache.set(cell, cached)
+            return cached
+        metrics.incr("snap_cache.db_miss")
+
+    snap = await _fetch_snap(point, client)
+    if not snap:
+        return None
+
+    _snap_cache.set(cell, snap)
+    if settings.snap_cache_persist:
+        try:
+            await _persist_snap(cell, snap)
+        except Exception as e:
+            logger.warning("Snap cache write failed: %s", e)
+
+    return snap
@@ -0,0 +1,42 @@
+import httpx
+
+from app.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.http2_enabled,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_s,
+        ),
+        timeout=httpx.Timeout(10.0, connect=settings.http_connect_timeout_s),
+    )
+
+
+async def open_http_client() -> None:
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the app-wide pooled client, creating it lazily outside the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def upstream_timeout(total_s: float) -> httpx.Timeout:
+    return httpx.Timeout(total_s, connect=settings.http_connect_timeout_s)
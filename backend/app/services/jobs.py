@@ -0,0 +1,410 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from sqlalchemy import Select, delete, exists, func, insert, literal, select, update
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models import ComputeJob, Session, Venue
+from app.services.events import publish_sessions
+from app.services.metrics import metrics
+from app.services.session_utils import SESSION_TTL_S, generate_id
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[str], Awaitable[None]]
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes orphan re-queues
+ORPHAN_LOCK_KEY = 7_271_102
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobQueue(ABC):
+    """Runs handler(session_id) for enqueued sessions on a bounded pool of worker tasks."""
+
+    def __init__(self, handler: JobHandler, concurrency: int) -> None:
+        self._handler = handler
+        self._concurrency = concurrency
+        self._workers: list[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"compute-worker-{i}")
+            for i in range(self._concurrency)
+        ]
+
+    async def stop(self, timeout_s: float) -> None:
+        """Let pending work finish for up to timeout_s, then cancel what is still running."""
+        self._stopping = True
+        if self._workers:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._drain(), timeout_s)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def requeue_orphans(self) -> None:
+        """Enqueue live sessions left computing with no job, e.g. by a crash or restart."""
+        async with async_session_factory() as db:
+            session_ids = (await db.scalars(self._orphans())).all()
+        requeued = 0
+        for session_id in session_ids:
+            try:
+                await self.enqueue(session_id)
+            except QueueFullError:
+                logger.warning(
+                    "Compute queue full; %d orphaned jobs not re-queued",
+                    len(session_ids) - requeued,
+                )
+                break
+            requeued += 1
+        if requeued:
+            metrics.incr("jobs.requeued_orphans", requeued)
+            logger.info("Re-queued %d orphaned compute jobs", requeued)
+
+    def _orphans(self) -> Select:
+        return select(Session.id).where(
+            Session.status == "computing",
+            Session.created_at >= int(time.time()) - SESSION_TTL_S,
+        )
+
+    async def _run(self, session_id: str) -> None:
+        started = time.perf_counter()
+        try:
+            await self._handler(session_id)
+            metrics.incr("jobs.completed")
+        finally:
+            metrics.observe("jobs.run", time.perf_counter() - started)
+
+    @abstractmethod
+    async def enqueue(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    async def _drain(self) -> None: ...
+
+    @abstractmethod
+    async def _worker_loop(self) -> None: ...
+
+
+class InProcessJobQueue(JobQueue):
+    def __init__(self, handler: JobHandler, concurrency: int, max_size: int) -> None:
+        super().__init__(handler, concurrency)
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_size)
+
+    async def enqueue(self, session_id: str) -> None:
+        if self._stopping:
+            metrics.incr("jobs.rejected")
+            raise QueueFullError("Compute queue is shutting down")
+        try:
+            self._queue.put_nowait(session_id)
+        except asyncio.QueueFull as e:
+            metrics.incr("jobs.rejected")
+            raise QueueFullError("Compute queue is full") from e
+        metrics.incr("jobs.enqueued")
+
+    async def _drain(self) -> None:
+        # Queued jobs only live in this process, so run them before exiting;
+        # whatever misses the deadline is re-queued by the next startup
+        await self._queue.join()
+
+    async def _worker_loop(self) -> None:
+        while True:
+            session_id = await self._queue.get()
+            try:
+                await self._run(session_id)
+            except Exception as e:
+                metrics.incr("jobs.failed")
+                logger.error("Compute job for session %s failed: %s", session_id, e)
+            finally:
+                self._queue.task_done()
+
+
+class DatabaseJobQueue(JobQueue):
+    """
+    Job queue backed by the compute_jobs table, so every uvicorn worker
+    polls and claims from the same queue. A job is claimed with a
+    conditional UPDATE (queued -> running), so only one worker wins it;
+    running jobs whose worker died are re-queued after stale_after_s. On
+    stop, workers claim nothing new and queued jobs stay for the next start.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        concurrency: int,
+        max_size: int,
+        poll_interval_s: float,
+        stale_after_s: int,
+        max_attempts: int,
+    ) -> None:
+        super().__init__(handler, concurrency)
+        self._max_size = max_size
+        self._poll_interval_s = poll_interval_s
+        self._stale_after_s = stale_after_s
+        self._max_attempts = max_attempts
+        # Shared by this process's worker tasks: one stale-job sweep per interval
+        self._stale_check_interval_s = stale_after_s / 10
+        self._next_stale_check = 0.0
+
+    async def _queued_count(self, db) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(ComputeJob).where(ComputeJob.status == "queued")
+        )
+
+    async def enqueue(self, session_id: str) -> None:
+        async with async_session_factory() as db:
+            if await self._queued_count(db) >= self._max_size:
+                metrics.incr("jobs.rejected")
+                raise QueueFullError("Compute queue is full")
+
+            db.add(
+                ComputeJob(
+                    id=generate_id(),
+                    session_id=session_id,
+                    status="queued",
+                    attempts=0,
+                    created_at=int(time.time()),
+                )
+            )
+            await db.commit()
+        metrics.incr("jobs.enqueued")
+
+    def _orphans(self) -> Select:
+        return (
+            super()
+            ._orphans()
+            .where(
+                ~exists().where(
+                    ComputeJob.session_id == Session.id,
+                    ComputeJob.status.in_(ACTIVE_STATUSES),
+                )
+            )
+        )
+
+    async def requeue_orphans(self) -> None:
+        """
+        Every uvicorn worker runs this at startup, so each orphan is queued by
+        one INSERT ... SELECT that re-checks it still has no active job. On
+        PostgreSQL the whole pass holds an advisory lock, so a second worker
+        only looks once the first one's jobs are committed.
+        """
+        async with async_session_factory() as db:
+            session_ids = (await db.scalars(self._orphans())).all()
+        if not session_ids:
+            return
+
+        now = int(time.time())
+        requeued = 0
+        async with async_session_factory() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                await db.execute(select(func.pg_advisory_xact_lock(ORPHAN_LOCK_KEY)))
+            room = max(self._max_size - await self._queued_count(db), 0)
+            for session_id in session_ids[:room]:
+                result = await db.execute(
+                    insert(ComputeJob).from_select(
+                        ["id", "session_id", "status", "attempts", "created_at"],
+                        self._orphans()
+                        .with_only_columns(
+                            literal(generate_id()),
+                            Session.id,
+                            literal("queued"),
+                            literal(0),
+                            literal(now, ComputeJob.created_at.type),
+                        )
+                        .where(Session.id == session_id),
+                    )
+                )
+                requeued += result.rowcount
+            await db.commit()
+
+        if len(session_ids) > room:
+            logger.warning(
+                "Compute queue full; %d orphaned jobs not re-queued", len(session_ids) - room
+            )
+        if requeued:
+            metrics.incr("jobs.enqueued", requeued)
+            metrics.incr("jobs.requeued_orphans", requeued)
+            logger.info("Re-queued %d orphaned compute jobs", requeued)
+
+    async def _drain(self) -> None:
+        await asyncio.wait(self._workers)
+
+    async def _requeue_stale(self) -> None:
+        """
+        Re-queue running jobs whose worker died; those out of attempts fail
+        and their sessions go back to ready_to_compute.
+        """
+        now = int(time.time())
+        stale = (
+            ComputeJob.status == "running",
+            ComputeJob.started_at < now - self._stale_after_s,
+        )
+        async with async_session_factory() as db:
+            await db.execute(
+                update(ComputeJob)
+                .where(*stale, ComputeJob.attempts < self._max_attempts)
+                .values(status="queued")
+            )
+            exhausted = (
+                await db.execute(
+                    select(ComputeJob.id, ComputeJob.session_id).where(
+                        *stale, ComputeJob.attempts >= self._max_attempts
+                    )
+                )
+            ).all()
+            if not exhausted:
+                await db.commit()
+                return
+
+            await db.execute(
+                update(ComputeJob)
+                .where(ComputeJob.id.in_([job_id for job_id, _ in exhausted]), *stale)
+                .values(status="failed", finished_at=now)
+            )
+            session_ids = (
+                await db.scalars(
+                    select(Session.id).where(
+                        Session.id.in_({session_id for _, session_id in exhausted}),
+                        Session.status == "computing",
+                        ~exists().where(
+                            ComputeJob.session_id == Session.id,
+                            ComputeJob.status.in_(ACTIVE_STATUSES),
+                        ),
+                    )
+                )
+            ).all()
+            if session_ids:
+                # As the pipeline's own reset: drop any partial shortlist
+                await db.execute(delete(Venue).where(Venue.session_id.in_(session_ids)))
+                await db.execute(
+                    update(Session)
+                    .where(Session.id.in_(session_ids))
+                    .values(
+                        status="ready_to_compute", updated_at=now, version=Session.version + 1
+                    )
+                )
+            await db.commit()
+            metrics.incr("jobs.failed", len(exhausted))
+            logger.error(
+                "Gave up on %d stale compute jobs after %d attempts",
+                len(exhausted),
+                self._max_attempts,
+            )
+            await publish_sessions(db, session_ids)
+
+    async def _claim(self) -> ComputeJob | None:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(ComputeJob)
+                .where(ComputeJob.status == "queued")
+                .order_by(ComputeJob.created_at)
+                .limit(1)
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                return None
+
+            claimed = await db.execute(
+                update(ComputeJob)
+                .where(ComputeJob.id == job.id, ComputeJob.status == "queued")
+                .values(
+                    status="running",
+                    started_at=int(time.time()),
+                    attempts=ComputeJob.attempts + 1,
+                )
+            )
+            await db.commit()
+            return job if claimed.rowcount == 1 else None
+
+    async def _finish(self, job_id: str, status: str) -> None:
+        async with async_session_factory() as db:
+            await db.execute(
+                update(ComputeJob)
+                .where(ComputeJob.id == job_id)
+                .values(status=status, finished_at=int(time.time()))
+            )
+            await db.commit()
+
+    async def _worker_loop(self) -> None:
+        while not self._stopping:
+            try:
+                if time.monotonic() >= self._next_stale_check:
+                    self._next_stale_check = time.monotonic() + self._stale_check_interval_s
+                    await self._requeue_stale()
+                job = await self._claim()
+            except Exception as e:
+                logger.error("Compute job poll failed: %s", e)
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self._poll_interval_s)
+                continue
+
+            status = "done"
+            try:
+                await self._run(job.session_id)
+            except asyncio.CancelledError:
+                # The pipeline has reset the session; nothing should retry this job
+                with suppress(Exception):
+                    await self._finish(job.id, "failed")
+                raise
+            except Exception as e:
+                status = "failed"
+                metrics.incr("jobs.failed")
+                logger.error("Compute job for session %s failed: %s", job.session_id, e)
+
+            try:
+                await self._finish(job.id, status)
+            except Exception as e:
+                logger.error("Could not mark compute job %s %s: %s", job.id, status, e)
+
+
+_queue: JobQueue | None = None
+
+
+def build_job_queue(handler: JobHandler) -> JobQueue:
+    if settings.compute_job_backend == "database":
+        return DatabaseJobQueue(
+            handler,
+            concurrency=settings.compute_job_concurrency,
+            max_size=settings.compute_job_queue_size,
+            poll_interval_s=settings.compute_job_poll_interval_s,
+            stale_after_s=settings.compute_job_stale_after_s,
+            max_attempts=settings.compute_job_max_attempts,
+        )
+    return InProcessJobQueue(
+        handler,
+        concurrency=settings.compute_job_concurrency,
+        max_size=settings.compute_job_queue_size,
+    )
+
+
+async def start_job_queue(handler: JobHandler) -> None:
+    global _queue
+    _queue = build_job_queue(handler)
+    await _queue.start()
+    await _queue.requeue_orphans()
+
+
+async def stop_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop(settings.compute_job_shutdown_timeout_s)
+        _queue = None
+
+
+def get_job_queue() -> JobQueue:
+    if _queue is None:
+        raise RuntimeError("Compute job queue is not running")
+    return _queue
@@ -0,0 +1,31 @@
+import asyncio
+
+import anthropic
+
+from app.config import settings
+
+_client: anthropic.AsyncAnthropic | None = None
+_slots: asyncio.Semaphore | None = None
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Return the app-wide Anthropic client, so every LLM call reuses one connection pool."""
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    return _client
+
+
+async def close_anthropic_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def llm_slots() -> asyncio.Semaphore:
+    """Process-wide cap on in-flight LLM requests across all AI services."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.llm_max_concurrency)
+    return _slots
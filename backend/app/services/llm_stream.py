@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import anthropic
+
+from app.config import settings
+from app.services.llm_client import get_anthropic_client, llm_slots
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class JSONArrayParser:
+    """
+    Incremental parser for a streamed top-level JSON array of objects.
+
+    feed() takes the next chunk of text and returns the objects completed by
+    it. Anything before the opening "[" (such as a markdown fence) is ignored,
+    and an object that fails to decode is skipped without losing the rest.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start = -1
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        if self._done:
+            return []
+        self._buffer += chunk
+        items: list[dict[str, Any]] = []
+
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            ch = buffer[i]
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._object_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # "]" closing the top-level array
+                    self._done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(buffer[self._object_start : i + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._object_start = -1
+            i += 1
+
+        # Keep only the unfinished object (if any) for the next chunk
+        keep_from = self._object_start if self._object_start >= 0 else i
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._object_start >= 0:
+            self._object_start = 0
+        return items
+
+    def _decode(self, text: str) -> dict[str, Any] | None:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            item = None
+        if not isinstance(item, dict):
+            self.skipped += 1
+            return None
+        return item
+
+
+async def stream_json_array(
+    client: anthropic.AsyncAnthropic,
+    *,
+    model: str,
+    max_tokens: int,
+    system: str | list[dict[str, Any]],
+    user_message: str,
+    on_item: Callable[[dict[str, Any]], Awaitable[None]],
+    metric: str,
+) -> None:
+    """Stream a JSON-array response, awaiting on_item for each object as soon as it is complete."""
+    parser = JSONArrayParser()
+    metrics.incr(f"{metric}.requests")
+    async with client.messages.stream(
+        model=model,
+        max_tokens=max_tokens,
+        system=system,
+        messages=[{"role": "user", "content": user_message}],
+    ) as stream:
+        async for text in stream.text_stream:
+            for item in parser.feed(text):
+                await on_item(item)
+        usage = (await stream.get_final_message()).usage
+
+    metrics.incr(f"{metric}.input_tokens", usage.input_tokens)
+    metrics.incr(f"{metric}.output_tokens", usage.output_tokens)
+    metrics.incr(f"{metric}.cache_read_tokens", getattr(usage, "cache_read_input_tokens", None) or 0)
+    metrics.incr(
+        f"{metric}.cache_write_tokens", getattr(usage, "cache_creation_input_tokens", None) or 0
+    )
+    if parser.skipped:
+        metrics.incr(f"{metric}.malformed_items", parser.skipped)
+        logger.warning("Skipped %d malformed items in %s response", parser.skipped, metric)
+
+
+def plan_batches(items: list[T]) -> list[list[T]]:
+    """Split items into LLM requests according to settings.llm_execution_strategy."""
+    if not items:
+        return []
+    if settings.llm_execution_strategy == "per_venue":
+        size = 1
+    elif settings.llm_execution_strategy == "chunked":
+        size = max(1, settings.llm_chunk_size)
+    else:
+        size = len(items)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def stream_in_batches(
+    items: list[T],
+    *,
+    model: str,
+    max_tokens: int,
+    system: str | list[dict[str, Any]],
+    build_message: Callable[[list[T]], str],
+    is_done: Callable[[T], bool],
+    on_item: Callable[[dict[str, Any]], Awaitable[None]],
+    metric: str,
+    attempts: int = 2,
+) -> list[T]:
+    """
+    Stream results for items in concurrent requests (see plan_batches), each
+    holding one of the shared llm_slots while in flight. A failed or
+    truncated request keeps what it delivered and retries only its own items
+    that are still missing. Returns the items missing after all attempts.
+    """
+    client = get_anthropic_client()
+
+    async def run_batch(batch: list[T]) -> list[T]:
+        pending = batch
+        for attempt in range(attempts):
+            try:
+                async with llm_slots():
+                    await stream_json_array(
+                        client,
+                        model=model,
+                        max_tokens=max_tokens,
+                        system=system,
+                        user_message=build_message(pending),
+                        on_item=on_item,
+                        metric=metric,
+                    )
+            except Exception as e:
+                metrics.incr(f"{metric}.failed_requests")
+                logger.warning("%s request attempt %d failed: %s", metric, attempt + 1, e)
+
+            pending = [item for item in pending if not is_done(item)]
+            if not pending:
+                break
+            if attempt + 1 < attempts:
+                metrics.incr(f"{metric}.venues_retried", len(pending))
+                logger.warning("%s missing %d items, retrying those", metric, len(pending))
+        return pending
+
+    missing = await asyncio.gather(*(run_batch(batch) for batch in plan_batches(items)))
+    return [item for batch in missing for item in batch]
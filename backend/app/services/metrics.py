@@ -0,0 +1,31 @@
+from collections import defaultdict
+from typing import Any
+
+
+class Metrics:
+    """Process-local counters and timings, exposed via GET /api/metrics."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        entry = self._timings.setdefault(
+            name, {"count": 0, "total_s": 0.0, "max_s": 0.0, "last_s": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_s"] += seconds
+        entry["max_s"] = max(entry["max_s"], seconds)
+        entry["last_s"] = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": dict(self._counters),
+            "timings": {name: dict(entry) for name, entry in self._timings.items()},
+        }
+
+
+metrics = Metrics()
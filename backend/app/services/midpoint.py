@@ -1,11 +1,33 @@
+import asyncio
+import logging
+
+import numpy as np
+
+from app.config import settings
 from app.services.geocoding import LatLng
-from app.services.routing import get_transit_times
+from app.services.routing import (
+    MAX_MATRIX_DESTINATIONS,
+    get_transit_time_matrix,
+    get_transit_times,
+)
+from app.services.metrics import metrics
+from app.services.transit_graph import get_transit_graph
+
+logger = logging.getLogger(__name__)
 
 MIDPOINT_MAX_ITERATIONS = 3
 MIDPOINT_CONVERGENCE_THRESHOLD = 0.1
 MIDPOINT_DAMPING_FACTOR = 0.3
 LONG_DISTANCE_THRESHOLD = 3600  # 60 min in seconds
 
+# Grid candidates span +/- this fraction of the midpoint->user distance
+# along the A-B axis, and across it.
+GRID_AXIS_SPAN = 0.5
+GRID_CROSS_SPAN = 0.3
+# The local engine can afford a much wider, denser search area
+LOCAL_AXIS_SPAN = 0.8
+LOCAL_CROSS_SPAN = 0.6
+
 
 class MidpointResult:
     def __init__(
@@ -39,7 +61,70 @@ def _shift_toward_slower(
     }
 
 
-async def find_fair_midpoint(location_a: LatLng, location_b: LatLng) -> MidpointResult:
+def candidate_grid(
+    a: LatLng,
+    b: LatLng,
+    size: int,
+    axis_span: float = GRID_AXIS_SPAN,
+    cross_span: float = GRID_CROSS_SPAN,
+) -> np.ndarray:
+    """
+    size x size grid of (lat, lng) candidates centred on the geographic
+    midpoint and aligned with the A-B axis, built in a local planar frame
+    where longitude is scaled by cos(latitude).
+    """
+    center = geographic_midpoint(a, b)
+    cos_lat = max(np.cos(np.radians(center["lat"])), 1e-6)
+
+    axis = np.array([b["lat"] - a["lat"], (b["lng"] - a["lng"]) * cos_lat]) / 2
+    cross = np.array([-axis[1], axis[0]])
+
+    along, across = np.meshgrid(
+        np.linspace(-axis_span, axis_span, size),
+        np.linspace(-cross_span, cross_span, size),
+        indexing="ij",
+    )
+    offsets = along.reshape(-1, 1) * axis + across.reshape(-1, 1) * cross
+
+    return np.column_stack(
+        [center["lat"] + offsets[:, 0], center["lng"] + offsets[:, 1] / cos_lat]
+    )
+
+
+def rank_candidates(times: np.ndarray, objective: str) -> np.ndarray:
+    """Indices of reachable rows of an (n, 2) travel-time array, best first."""
+    reachable = np.isfinite(times).all(axis=1)
+    longest = np.where(reachable, times.max(axis=1, initial=0), np.inf)
+    gap = np.where(reachable, np.abs(times[:, 0] - times[:, 1]), np.inf)
+
+    # np.lexsort sorts by the last key first
+    if objective == "balance":
+        order = np.lexsort((longest, gap))
+    else:
+        order = np.lexsort((gap, longest))
+    return order[reachable[order]]
+
+
+def best_candidate(times: np.ndarray, objective: str) -> int | None:
+    """Index of the best row of an (n, 2) travel-time array; NaN/inf rows are unreachable."""
+    ranked = rank_candidates(times, objective)
+    return int(ranked[0]) if len(ranked) else None
+
+
+def _build_result(candidate: LatLng, time_a: float, time_b: float) -> MidpointResult:
+    warning = None
+    if max(time_a, time_b) > LONG_DISTANCE_THRESHOLD:
+        warning = "Public transport time exceeds 60 minutes. Consider alternative meeting locations."
+
+    return MidpointResult(
+        midpoint=candidate,
+        travel_time_a=round(time_a),
+        travel_time_b=round(time_b),
+        warning=warning,
+    )
+
+
+async def _line_search(location_a: LatLng, location_b: LatLng) -> MidpointResult:
     candidate = geographic_midpoint(location_a, location_b)
     time_a = 0.0
     time_b = 0.0
@@ -55,13 +140,66 @@ async def find_fair_midpoint(location_a: LatLng, location_b: LatLng) -> Midpoint
 
         candidate = _shift_toward_slower(candidate, location_a, location_b, time_a, time_b)
 
-    warning = None
-    if max(time_a, time_b) > LONG_DISTANCE_THRESHOLD:
-        warning = "Public transport time exceeds 60 minutes. Consider alternative meeting locations."
+    return _build_result(candidate, time_a, time_b)
 
-    return MidpointResult(
-        midpoint=candidate,
-        travel_time_a=round(time_a),
-        travel_time_b=round(time_b),
-        warning=warning,
+
+async def _grid_search(location_a: LatLng, location_b: LatLng) -> MidpointResult:
+    size = min(settings.midpoint_grid_size, int(np.sqrt(MAX_MATRIX_DESTINATIONS)))
+    grid = candidate_grid(location_a, location_b, size)
+    candidates: list[LatLng] = [{"lat": float(lat), "lng": float(lng)} for lat, lng in grid]
+
+    matrix = await get_transit_time_matrix(location_a, location_b, candidates)
+    times = np.array([t if t is not None else (np.nan, np.nan) for t in matrix], dtype=float)
+
+    best = best_candidate(times, settings.midpoint_objective)
+    if best is None:
+        raise RuntimeError("No transit route to any midpoint candidate")
+
+    return _build_result(candidates[best], times[best, 0], times[best, 1])
+
+
+async def _local_search(location_a: LatLng, location_b: LatLng) -> MidpointResult:
+    graph = get_transit_graph()
+    if graph is None:
+        return await _grid_search(location_a, location_b)
+
+    grid = candidate_grid(
+        location_a,
+        location_b,
+        settings.midpoint_local_grid_size,
+        LOCAL_AXIS_SPAN,
+        LOCAL_CROSS_SPAN,
     )
+    estimates = await asyncio.to_thread(graph.travel_times, [location_a, location_b], grid)
+    metrics.incr("midpoint.local_candidates", len(grid))
+
+    shortlist = rank_candidates(estimates.T, settings.midpoint_objective)[:MAX_MATRIX_DESTINATIONS]
+    if not len(shortlist):
+        return await _grid_search(location_a, location_b)
+
+    candidates: list[LatLng] = [
+        {"lat": float(grid[i, 0]), "lng": float(grid[i, 1])} for i in shortlist
+    ]
+
+    # Google only confirms the shortlist; fall back to the local estimate if it fails
+    try:
+        matrix = await get_transit_time_matrix(location_a, location_b, candidates)
+    except Exception as e:
+        logger.warning("Distance Matrix check failed, using local transit estimate: %s", e)
+        best = int(shortlist[0])
+        return _build_result(candidates[0], estimates[0, best], estimates[1, best])
+
+    times = np.array([t if t is not None else (np.nan, np.nan) for t in matrix], dtype=float)
+    best = best_candidate(times, settings.midpoint_objective)
+    if best is None:
+        raise RuntimeError("No transit route to any midpoint candidate")
+
+    return _build_result(candidates[best], times[best, 0], times[best, 1])
+
+
+async def find_fair_midpoint(location_a: LatLng, location_b: LatLng) -> MidpointResult:
+    if settings.midpoint_engine == "local":
+        return await _local_search(location_a, location_b)
+    if settings.midpoint_engine == "grid":
+        return await _grid_search(location_a, location_b)
+    return await _line_search(location_a, location_b)
@@ -1,10 +1,23 @@
+import asyncio
+import json
+import logging
 import math
+import time
 from typing import Any
 
 import httpx
+from sqlalchemy import select
 
 from app.config import settings
+from app.database import async_session_factory
+from app.models import PlaceSearchCache
+from app.services.cache import TTLCache
+from app.services.geo import geohash_encode, haversine_m
 from app.services.geocoding import LatLng
+from app.services.http_client import get_http_client, upstream_timeout
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 GOOGLE_PLACES_URL = "https://places.googleapis.com/v1/places:searchNearby"
 
@@ -20,41 +33,54 @@ RELAXED_MIN_RATING = 3.8
 RELAXED_MIN_REVIEWS = 30
 
 VENUE_TYPES = ["restaurant", "cafe"]
+MAX_RESULT_COUNT = 20
+
+# geohash -> {"<rank>:<radius>": cached search}
+_search_cache: TTLCache[dict[str, dict[str, Any]]] = TTLCache(
+    "places_cache", settings.places_cache_max_entries, settings.places_cache_ttl_s
+)
 
 
-async def _search_nearby(center: LatLng, radius: float) -> list[dict[str, Any]]:
+async def _search_nearby(
+    center: LatLng,
+    radius: float,
+    rank: str = "POPULARITY",
+    client: httpx.AsyncClient | None = None,
+) -> list[dict[str, Any]]:
     api_key = settings.google_places_api_key
     if not api_key:
         raise RuntimeError("GOOGLE_PLACES_API_KEY is not set")
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            GOOGLE_PLACES_URL,
-            headers={
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": api_key,
-                "X-Goog-FieldMask": (
-                    "places.id,places.displayName,places.formattedAddress,"
-                    "places.location,places.rating,places.userRatingCount,"
-                    "places.priceLevel,places.googleMapsUri,places.types,"
-                    "places.reviews,places.editorialSummary"
-                ),
-            },
-            json={
-                "includedTypes": VENUE_TYPES,
-                "maxResultCount": 20,
-                "rankPreference": "POPULARITY",
-                "locationRestriction": {
-                    "circle": {
-                        "center": {
-                            "latitude": center["lat"],
-                            "longitude": center["lng"],
-                        },
-                        "radius": radius,
-                    }
-                },
+    metrics.incr("places.api_calls")
+    client = client or get_http_client()
+    resp = await client.post(
+        GOOGLE_PLACES_URL,
+        headers={
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": api_key,
+            "X-Goog-FieldMask": (
+                "places.id,places.displayName,places.formattedAddress,"
+                "places.location,places.rating,places.userRatingCount,"
+                "places.priceLevel,places.googleMapsUri,places.types,"
+                "places.reviews,places.editorialSummary"
+            ),
+        },
+        json={
+            "includedTypes": VENUE_TYPES,
+            "maxResultCount": MAX_RESULT_COUNT,
+            "rankPreference": rank,
+            "locationRestriction": {
+                "circle": {
+                    "center": {
+                        "latitude": center["lat"],
+                        "longitude": center["lng"],
+                    },
+                    "radius": radius,
+                }
             },
-        )
+        },
+        timeout=upstream_timeout(settings.places_timeout_s),
+    )
 
     if resp.status_code != 200:
         raise RuntimeError(f"Google Places API error: {resp.status_code} - {resp.text}")
@@ -63,6 +89,154 @@ async def _search_nearby(center: LatLng, radius: float) -> list[dict[str, Any]]:
     return data.get("places", [])
 
 
+def _place_latlng(place: dict[str, Any]) -> LatLng:
+    location = place.get("location") or {}
+    return {"lat": location.get("latitude", 0.0), "lng": location.get("longitude", 0.0)}
+
+
+def _within_radius(
+    places: list[dict[str, Any]], center: LatLng, radius: float
+) -> list[dict[str, Any]]:
+    return [p for p in places if haversine_m(center, _place_latlng(p)) <= radius]
+
+
+def _cache_key(rank: str, radius: float) -> str:
+    return f"{rank}:{radius:g}"
+
+
+def _answers(entry: dict[str, Any], center: LatLng, radius: float, rank: str) -> bool:
+    """
+    Whether a cached search can stand in for (center, radius, rank).
+
+    The same query is always reusable. A larger search only answers a smaller
+    circle when it holds every place in it: a page that came back short, or
+    a DISTANCE page out to its farthest result. A full POPULARITY page
+    trimmed down would keep only the popular places of the larger circle.
+    """
+    if entry["rank"] == rank and entry["radius"] == radius:
+        return True
+    places = entry["places"]
+    if len(places) < MAX_RESULT_COUNT:
+        complete_radius = entry["radius"]
+    elif entry["rank"] == "DISTANCE":
+        complete_radius = max(haversine_m(entry["center"], _place_latlng(p)) for p in places)
+    else:
+        return False
+    return complete_radius - haversine_m(entry["center"], center) >= radius
+
+
+def _pick_cached(
+    entries: list[dict[str, Any]], center: LatLng, radius: float, rank: str
+) -> dict[str, Any] | None:
+    """Smallest fresh cached search that answers the requested one."""
+    min_fetched_at = time.time() - settings.places_cache_ttl_s
+    candidates = [
+        entry
+        for entry in entries
+        if entry["radius"] >= radius
+        and entry["fetched_at"] >= min_fetched_at
+        and _answers(entry, center, radius, rank)
+    ]
+    return min(candidates, key=lambda e: e["radius"]) if candidates else None
+
+
+async def _load_persisted_search(
+    geohash: str, center: LatLng, radius: float, rank: str
+) -> dict[str, Any] | None:
+    min_fetched_at = int(time.time()) - settings.places_cache_ttl_s
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(PlaceSearchCache).where(
+                PlaceSearchCache.geohash == geohash,
+                PlaceSearchCache.radius >= radius,
+                PlaceSearchCache.fetched_at >= min_fetched_at,
+            )
+        )
+        rows = result.scalars().all()
+
+    entries = [
+        {
+            "radius": row.radius,
+            "rank": row.rank_preference or "POPULARITY",
+            "center": {"lat": row.center_lat, "lng": row.center_lng},
+            "places": json.loads(row.places),
+            "fetched_at": row.fetched_at,
+        }
+        for row in rows
+    ]
+    return _pick_cached(entries, center, radius, rank)
+
+
+async def _persist_search(geohash: str, entry: dict[str, Any]) -> None:
+    async with async_session_factory() as db:
+        await db.merge(
+            PlaceSearchCache(
+                id=f"{geohash}:{_cache_key(entry['rank'], entry['radius'])}",
+                geohash=geohash,
+                radius=entry["radius"],
+                rank_preference=entry["rank"],
+                center_lat=entry["center"]["lat"],
+                center_lng=entry["center"]["lng"],
+                places=json.dumps(entry["places"]),
+                fetched_at=entry["fetched_at"],
+            )
+        )
+        await db.commit()
+
+
+async def _cached_search_nearby(
+    center: LatLng, radius: float, rank: str = "POPULARITY"
+) -> list[dict[str, Any]]:
+    """
+    _search_nearby behind a geohash-cell cache.
+
+    A fresh result for a larger radius is reused and trimmed to the requested
+    circle by distance when it is complete for that circle (see _answers), so
+    a DISTANCE-ranked 3000 m search also answers the inner lookups in that cell.
+    """
+    if not settings.places_cache_enabled:
+        return await _search_nearby(center, radius, rank)
+
+    geohash = geohash_encode(center, settings.places_cache_geohash_precision)
+    entries = _search_cache.get(geohash) or {}
+
+    entry = _pick_cached(list(entries.values()), center, radius, rank)
+    if entry is None and settings.places_cache_persist:
+        try:
+            entry = await _load_persisted_search(geohash, center, radius, rank)
+        except Exception as e:
+            logger.warning("Places cache lookup failed: %s", e)
+        if entry:
+            metrics.incr("places_cache.db_hit")
+            entries[_cache_key(entry["rank"], entry["radius"])] = entry
+            _search_cache.set(geohash, entries)
+        else:
+            metrics.incr("places_cache.db_miss")
+
+    if entry is not None:
+        metrics.incr("places_cache.calls_saved")
+        return _within_radius(entry["places"], center, radius)
+
+    places = await _search_nearby(center, radius, rank)
+    entry = {
+        "radius": float(radius),
+        "rank": rank,
+        "center": center,
+        "places": places,
+        "fetched_at": int(time.time()),
+    }
+    entries[_cache_key(rank, entry["radius"])] = entry
+    _search_cache.set(geohash, entries)
+
+    if settings.places_cache_persist:
+        try:
+            await _persist_search(geohash, entry)
+        except Exception as e:
+            logger.warning("Places cache write failed: %s", e)
+
+    return places
+
+
 def _filter_venues(
     venues: list[dict[str, Any]], min_rating: float, min_reviews: int
 ) -> list[dict[str, Any]]:
@@ -83,12 +257,31 @@ def _score_and_sort(venues: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return sorted(venues, key=score, reverse=True)
 
 
-async def search_venues(midpoint: LatLng) -> list[dict[str, Any]]:
+def _search_radii() -> list[int]:
+    radii: list[int] = []
+    radius = INITIAL_SEARCH_RADIUS
+    while radius <= MAX_SEARCH_RADIUS:
+        radii.append(radius)
+        radius = round(radius * RADIUS_MULTIPLIER)
+    return radii
+
+
+def _pick_widening(
+    raw_by_radius: dict[int, list[dict[str, Any]]], fallback_raw: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    for raw in raw_by_radius.values():
+        filtered = _filter_venues(raw, MIN_RATING, MIN_REVIEWS)
+        if len(filtered) >= MIN_VENUES:
+            return filtered
+    return _filter_venues(fallback_raw, RELAXED_MIN_RATING, RELAXED_MIN_REVIEWS)
+
+
+async def _search_iterative(midpoint: LatLng) -> list[dict[str, Any]]:
     radius = INITIAL_SEARCH_RADIUS
     filtered: list[dict[str, Any]] = []
 
     while radius <= MAX_SEARCH_RADIUS:
-        raw = await _search_nearby(midpoint, radius)
+        raw = await _cached_search_nearby(midpoint, radius)
         filtered = _filter_venues(raw, MIN_RATING, MIN_REVIEWS)
 
         if len(filtered) >= MIN_VENUES:
@@ -96,8 +289,40 @@ async def search_venues(midpoint: LatLng) -> list[dict[str, Any]]:
         radius = round(radius * RADIUS_MULTIPLIER)
 
     if len(filtered) < MIN_VENUES:
-        raw = await _search_nearby(midpoint, MAX_SEARCH_RADIUS)
+        raw = await _cached_search_nearby(midpoint, MAX_SEARCH_RADIUS)
         filtered = _filter_venues(raw, RELAXED_MIN_RATING, RELAXED_MIN_REVIEWS)
 
+    return filtered
+
+
+async def _search_single(midpoint: LatLng) -> list[dict[str, Any]]:
+    # Nearest-first, so the inner radii see every place they would have been
+    # sent; popularity is applied locally by _score_and_sort.
+    raw = await _cached_search_nearby(midpoint, MAX_SEARCH_RADIUS, "DISTANCE")
+    raw_by_radius = {r: _within_radius(raw, midpoint, r) for r in _search_radii()}
+    return _pick_widening(raw_by_radius, raw)
+
+
+async def _search_concurrent(midpoint: LatLng) -> list[dict[str, Any]]:
+    radii = _search_radii()
+    results = await asyncio.gather(
+        *(_cached_search_nearby(midpoint, r) for r in [*radii, MAX_SEARCH_RADIUS])
+    )
+    return _pick_widening(dict(zip(radii, results)), results[-1])
+
+
+_SEARCH_MODES = {
+    "iterative": _search_iterative,
+    "single": _search_single,
+    "concurrent": _search_concurrent,
+}
+
+
+async def search_venues(midpoint: LatLng) -> list[dict[str, Any]]:
+    mode = settings.places_search_mode
+    started = time.perf_counter()
+    filtered = await _SEARCH_MODES[mode](midpoint)
+    metrics.observe(f"places.search.{mode}", time.perf_counter() - started)
+
     scored = _score_and_sort(filtered)
     return scored[:MAX_VENUES]
@@ -1,21 +1,264 @@
+import asyncio
+import ipaddress
+import logging
+import math
+import re
 import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
-MAX_SESSIONS_PER_HOUR = 10
-ONE_HOUR_S = 60 * 60
+from sqlalchemy import delete, select
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-_ip_counts: dict[str, dict] = {}
+from app.config import settings
+from app.database import async_session_factory, dialect_insert
+from app.models import RateLimitCounter
+from app.services.metrics import metrics
 
+logger = logging.getLogger(__name__)
 
-def check_rate_limit(ip: str) -> bool:
-    now = time.time()
-    entry = _ip_counts.get(ip)
 
-    if entry is None or now > entry["reset_at"]:
-        _ip_counts[ip] = {"count": 1, "reset_at": now + ONE_HOUR_S}
+class RateLimitPolicy:
+    def __init__(self, name: str, path: str, limit: int, window_s: int, message: str):
+        self.name = name
+        self.path = re.compile(path)
+        self.limit = limit
+        self.window_s = window_s
+        self.message = message
+
+
+def _window(now: float, window_s: int) -> tuple[int, float]:
+    # Current fixed window index and how far through it we are (0..1)
+    return int(now // window_s), (now % window_s) / window_s
+
+
+def _max_count(limit: int, previous: int, elapsed: float) -> int:
+    """
+    Sliding-window counter: the previous window's count is weighted by the
+    part of it still inside the sliding window, so a request is allowed while
+    previous * (1 - elapsed) + current + 1 <= limit.
+    """
+    return math.floor(limit - previous * (1 - elapsed))
+
+
+class RateLimitStore(ABC):
+    """
+    Counts requests per key in sliding windows. hit() atomically checks and
+    records one request, and rejected requests are not counted. Expired
+    counters are evicted periodically.
+    """
+
+    def __init__(self, evict_interval_s: float) -> None:
+        self._evict_interval_s = evict_interval_s
+        self._evictor: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._evictor = asyncio.create_task(self._evict_loop(), name="rate-limit-evictor")
+
+    async def stop(self) -> None:
+        if self._evictor is not None:
+            self._evictor.cancel()
+            await asyncio.gather(self._evictor, return_exceptions=True)
+            self._evictor = None
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window_s: int) -> bool: ...
+
+    @abstractmethod
+    async def evict(self) -> int: ...
+
+    async def _evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._evict_interval_s)
+            try:
+                metrics.incr("rate_limit.evicted", await self.evict())
+            except Exception as e:
+                logger.error("Rate-limit eviction failed: %s", e)
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Per-process counters; limits are enforced separately by each worker."""
+
+    def __init__(self, evict_interval_s: float) -> None:
+        super().__init__(evict_interval_s)
+        # key -> [window, count, previous window's count, expires_at]
+        self._counters: dict[str, list[int]] = {}
+
+    async def hit(self, key: str, limit: int, window_s: int) -> bool:
+        window, elapsed = _window(time.time(), window_s)
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < window - 1:
+            count, previous = 0, 0
+        elif entry[0] == window - 1:
+            count, previous = 0, entry[1]
+        else:
+            count, previous = entry[1], entry[2]
+
+        if count >= _max_count(limit, previous, elapsed):
+            return False
+        self._counters[key] = [window, count + 1, previous, (window + 2) * window_s]
+        return True
+
+    async def evict(self) -> int:
+        now = time.time()
+        expired = [key for key, entry in self._counters.items() if entry[3] < now]
+        for key in expired:
+            del self._counters[key]
+        return len(expired)
+
+
+class DatabaseRateLimitStore(RateLimitStore):
+    """Counters in the rate_limit_counters table, shared by every uvicorn worker."""
+
+    async def hit(self, key: str, limit: int, window_s: int) -> bool:
+        window, elapsed = _window(time.time(), window_s)
+        async with async_session_factory() as db:
+            previous = await db.scalar(
+                select(RateLimitCounter.count).where(
+                    RateLimitCounter.key == key, RateLimitCounter.window == window - 1
+                )
+            )
+            max_count = _max_count(limit, previous or 0, elapsed)
+            if max_count < 1:
+                return False
+
+            # Insert the window's first hit, or increment only while under the
+            # limit; no row changes means the request is rejected
+            insert = dialect_insert(db)
+            result = await db.execute(
+                insert(RateLimitCounter)
+                .values(key=key, window=window, count=1, expires_at=(window + 2) * window_s)
+                .on_conflict_do_update(
+                    index_elements=["key", "window"],
+                    set_={"count": RateLimitCounter.count + 1},
+                    where=RateLimitCounter.count < max_count,
+                )
+            )
+            await db.commit()
+        return result.rowcount > 0
+
+    async def evict(self) -> int:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                delete(RateLimitCounter).where(RateLimitCounter.expires_at < int(time.time()))
+            )
+            await db.commit()
+        return result.rowcount
+
+
+_store: RateLimitStore | None = None
+
+
+def build_policies() -> list[RateLimitPolicy]:
+    return [
+        RateLimitPolicy(
+            "create",
+            r"^/api/sessions/?$",
+            settings.rate_limit_create_limit,
+            settings.rate_limit_create_window_s,
+            "Too many sessions. Try again later.",
+        ),
+        RateLimitPolicy(
+            "join",
+            r"^/api/sessions/[^/]+/join/?$",
+            settings.rate_limit_join_limit,
+            settings.rate_limit_join_window_s,
+            "Too many join attempts. Try again later.",
+        ),
+        RateLimitPolicy(
+            "compute",
+            r"^/api/sessions/[^/]+/compute/?$",
+            settings.rate_limit_compute_limit,
+            settings.rate_limit_compute_window_s,
+            "Too many computations. Try again later.",
+        ),
+    ]
+
+
+async def start_rate_limiter() -> None:
+    global _store
+    if settings.rate_limit_backend == "database":
+        _store = DatabaseRateLimitStore(settings.rate_limit_evict_interval_s)
+    else:
+        _store = MemoryRateLimitStore(settings.rate_limit_evict_interval_s)
+    await _store.start()
+
+
+async def stop_rate_limiter() -> None:
+    global _store
+    if _store is not None:
+        await _store.stop()
+        _store = None
+
+
+async def check_rate_limit(policy: RateLimitPolicy, client: str) -> bool:
+    """Record one request for client under policy; fails open if the store is unavailable."""
+    if _store is None:
+        return True
+    try:
+        allowed = await _store.hit(f"{policy.name}:{client}", policy.limit, policy.window_s)
+    except Exception as e:
+        logger.error("Rate-limit check failed for %s: %s", policy.name, e)
+        metrics.incr("rate_limit.errors")
         return True
+    metrics.incr(f"rate_limit.{policy.name}.{'allowed' if allowed else 'limited'}")
+    return allowed
 
-    if entry["count"] >= MAX_SESSIONS_PER_HOUR:
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def parse_networks(spec: str) -> tuple[Network, ...]:
+    """Comma-separated addresses or CIDR ranges, e.g. "127.0.0.1,10.0.0.0/8"."""
+    return tuple(
+        ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()
+    )
+
+
+def _is_trusted(address: str, trusted: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
         return False
+    return any(ip in network for network in trusted)
+
+
+def client_ip(scope: Scope, trusted_proxies: Sequence[Network] = ()) -> str:
+    """
+    Address to rate-limit by. Forwarding headers are only believed when the
+    connection comes from a trusted proxy; X-Forwarded-For is then read
+    right to left, skipping hops that are trusted proxies themselves.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else None
+    if not peer or not _is_trusted(peer, trusted_proxies):
+        return peer or "unknown"
+
+    headers = Headers(scope=scope)
+    hops = [hop.strip() for hop in (headers.get("x-forwarded-for") or "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            return hop
+    return (hops[0] if hops else None) or headers.get("x-real-ip") or peer
+
+
+class RateLimitMiddleware:
+    """Applies each policy to POSTs on its path, answering 429 once the client is over the limit."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.policies = build_policies()
+        self.trusted_proxies = parse_networks(settings.rate_limit_trusted_proxies)
 
-    entry["count"] += 1
-    return True
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST":
+            policy = next((p for p in self.policies if p.path.match(scope["path"])), None)
+            if policy and not await check_rate_limit(
+                policy, client_ip(scope, self.trusted_proxies)
+            ):
+                response = JSONResponse({"error": policy.message}, status_code=429)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
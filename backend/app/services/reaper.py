@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory, engine
+from app.models import (
+    ComputeJob,
+    PlaceSearchCache,
+    Session,
+    SessionEvent,
+    SnapCache,
+    TravelTimeCache,
+    Venue,
+    Vote,
+)
+from app.services.metrics import metrics
+from app.services.session_utils import SESSION_TTL_S
+
+logger = logging.getLogger(__name__)
+
+# Children first: votes reference venues, and everything references the session
+_CHILD_TABLES = (Vote, Venue, ComputeJob, SessionEvent)
+
+# Persistent cache tiers: (primary key, timestamp column, TTL setting). Reads
+# already ignore rows past their TTL; the reaper deletes them.
+_CACHE_TABLES = (
+    (PlaceSearchCache.id, PlaceSearchCache.fetched_at, "places_cache_ttl_s"),
+    (SnapCache.cell, SnapCache.created_at, "snap_cache_ttl_s"),
+    (TravelTimeCache.key, TravelTimeCache.created_at, "travel_time_cache_ttl_s"),
+)
+
+
+class SessionReaper:
+    """
+    Background task that deletes expired sessions and their child rows, and
+    persistent cache rows past their TTL, in bounded batches, one
+    transaction per batch, so a large backlog never holds the write lock
+    for long. On SQLite it also runs VACUUM and
+    ANALYZE after deletions, at most once per maintenance interval.
+    """
+
+    def __init__(
+        self,
+        interval_s: float,
+        grace_s: int,
+        batch_size: int,
+        max_batches: int,
+        maintenance_interval_s: int,
+        dry_run: bool = False,
+    ) -> None:
+        self._interval_s = interval_s
+        self._grace_s = grace_s
+        self._batch_size = batch_size
+        self._max_batches = max_batches
+        self._maintenance_interval_s = maintenance_interval_s
+        self._dry_run = dry_run
+        self._last_maintenance = time.monotonic()
+        self._deleted_since_maintenance = 0
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="session-reaper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _cutoff(self) -> int:
+        return int(time.time()) - SESSION_TTL_S - self._grace_s
+
+    async def sweep(self) -> dict[str, int]:
+        """Delete (or in dry-run mode, count) expired sessions, their children and stale cache rows."""
+        started = time.perf_counter()
+        cutoff = self._cutoff()
+        if self._dry_run:
+            counts = await self._count_expired(cutoff)
+            counts.update(await self._count_stale_cache())
+            for table, n in counts.items():
+                metrics.incr(f"reaper.would_delete.{table}", n)
+            logger.info("Session reaper dry run: would delete %s", counts)
+        else:
+            counts = {model.__tablename__: 0 for model in (Session, *_CHILD_TABLES)}
+            for _ in range(self._max_batches):
+                batch = await self._delete_batch(cutoff)
+                for table, n in batch.items():
+                    counts[table] += n
+                if batch["sessions"] < self._batch_size:
+                    break
+            cache_counts = await self._prune_caches()
+            counts.update(cache_counts)
+            for table, n in counts.items():
+                metrics.incr(f"reaper.deleted.{table}", n)
+            if any(counts.values()):
+                logger.info("Session reaper deleted %s", counts)
+            self._deleted_since_maintenance += counts["sessions"] + sum(cache_counts.values())
+            await self._maybe_maintain()
+
+        metrics.incr("reaper.sweeps")
+        metrics.observe("reaper.sweep", time.perf_counter() - started)
+        return counts
+
+    async def _count_expired(self, cutoff: int) -> dict[str, int]:
+        expired = select(Session.id).where(Session.created_at < cutoff).scalar_subquery()
+        async with async_session_factory() as db:
+            counts = {
+                "sessions": await db.scalar(
+                    select(func.count()).select_from(Session).where(Session.created_at < cutoff)
+                )
+                or 0
+            }
+            for model in _CHILD_TABLES:
+                counts[model.__tablename__] = (
+                    await db.scalar(
+                        select(func.count())
+                        .select_from(model)
+                        .where(model.session_id.in_(expired))
+                    )
+                    or 0
+                )
+        return counts
+
+    async def _delete_batch(self, cutoff: int) -> dict[str, int]:
+        async with async_session_factory() as db:
+            ids = (
+                await db.scalars(
+                    select(Session.id)
+                    .where(Session.created_at < cutoff)
+                    .order_by(Session.created_at)
+                    .limit(self._batch_size)
+                )
+            ).all()
+            if not ids:
+                return {"sessions": 0}
+            counts = await _delete_sessions(db, list(ids))
+            await db.commit()
+        return counts
+
+    async def _count_stale_cache(self) -> dict[str, int]:
+        now = int(time.time())
+        counts = {}
+        async with async_session_factory() as db:
+            for key, stamp, ttl_setting in _CACHE_TABLES:
+                cutoff = now - getattr(settings, ttl_setting)
+                counts[key.table.name] = (
+                    await db.scalar(select(func.count()).select_from(key.table).where(stamp < cutoff))
+                    or 0
+                )
+        return counts
+
+    async def _prune_caches(self) -> dict[str, int]:
+        now = int(time.time())
+        counts = {}
+        for key, stamp, ttl_setting in _CACHE_TABLES:
+            cutoff = now - getattr(settings, ttl_setting)
+            deleted = 0
+            for _ in range(self._max_batches):
+                async with async_session_factory() as db:
+                    keys = (
+                        await db.scalars(select(key).where(stamp < cutoff).limit(self._batch_size))
+                    ).all()
+                    if not keys:
+                        break
+                    result = await db.execute(delete(key.table).where(key.in_(keys)))
+                    await db.commit()
+                deleted += result.rowcount
+                if len(keys) < self._batch_size:
+                    break
+            counts[key.table.name] = deleted
+        return counts
+
+    async def _maybe_maintain(self) -> None:
+        if engine.dialect.name != "sqlite" or not self._deleted_since_maintenance:
+            return
+        if time.monotonic() - self._last_maintenance < self._maintenance_interval_s:
+            return
+
+        started = time.perf_counter()
+        # VACUUM cannot run inside a transaction
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM")
+            await conn.exec_driver_sql("ANALYZE")
+        self._last_maintenance = time.monotonic()
+        self._deleted_since_maintenance = 0
+        metrics.observe("reaper.sqlite_maintenance", time.perf_counter() - started)
+        logger.info("Session reaper ran VACUUM and ANALYZE")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                metrics.incr("reaper.failed")
+                logger.error("Session reaper sweep failed: %s", e)
+            await asyncio.sleep(self._interval_s)
+
+
+async def _delete_sessions(db: AsyncSession, session_ids: list[str]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for model in _CHILD_TABLES:
+        result = await db.execute(delete(model).where(model.session_id.in_(session_ids)))
+        counts[model.__tablename__] = result.rowcount
+    result = await db.execute(delete(Session).where(Session.id.in_(session_ids)))
+    counts["sessions"] = result.rowcount
+    return counts
+
+
+_reaper: SessionReaper | None = None
+
+
+async def start_reaper() -> None:
+    global _reaper
+    if not settings.session_reaper_enabled:
+        return
+    _reaper = SessionReaper(
+        interval_s=settings.session_reaper_interval_s,
+        grace_s=settings.session_reaper_grace_s,
+        batch_size=settings.session_reaper_batch_size,
+        max_batches=settings.session_reaper_max_batches,
+        maintenance_interval_s=settings.sqlite_maintenance_interval_s,
+        dry_run=settings.session_reaper_dry_run,
+    )
+    await _reaper.start()
+
+
+async def stop_reaper() -> None:
+    global _reaper
+    if _reaper is not None:
+        await _reaper.stop()
+        _reaper = None
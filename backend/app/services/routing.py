@@ -2,25 +2,84 @@ import httpx
 
 from app.config import settings
 from app.services.geocoding import LatLng
+from app.services import travel_time_cache
+from app.services.http_client import get_http_client, upstream_timeout
+from app.services.metrics import metrics
 
 GOOGLE_DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
+# Distance Matrix allows at most 25 destinations per request
+MAX_MATRIX_DESTINATIONS = 25
+
+
+async def get_transit_time_matrix(
+    source_a: LatLng,
+    source_b: LatLng,
+    destinations: list[LatLng],
+    client: httpx.AsyncClient | None = None,
+) -> list[tuple[float, float] | None]:
+    """Transit times from both users to each destination, using at most one Distance Matrix request.
+
+    Legs found in the travel-time cache are not re-requested. Entries are
+    None where either leg has no route.
+    """
+    bucket = travel_time_cache.time_bucket()
+    keys = [
+        (
+            travel_time_cache.leg_key(source_a, d, "transit", bucket),
+            travel_time_cache.leg_key(source_b, d, "transit", bucket),
+        )
+        for d in destinations
+    ]
+    cached = await travel_time_cache.get_many([k for pair in keys for k in pair])
+
+    uncached = [i for i, (ka, kb) in enumerate(keys) if ka not in cached or kb not in cached]
+    metrics.incr("travel_time_cache.elements_saved", 2 * (len(destinations) - len(uncached)))
+
+    times: list[tuple[float, float] | None] = [
+        (cached[ka], cached[kb]) if ka in cached and kb in cached else None for ka, kb in keys
+    ]
+    if not uncached:
+        metrics.incr("travel_time_cache.calls_saved")
+        return times
+
+    fetched = await _request_matrix(source_a, source_b, [destinations[i] for i in uncached], client)
+    fresh: dict[str, float] = {}
+    for i, leg_times in zip(uncached, fetched):
+        times[i] = leg_times
+        if leg_times is not None:
+            fresh[keys[i][0]], fresh[keys[i][1]] = leg_times
+
+    await travel_time_cache.put_many(fresh)
+    return times
+
+
+async def _request_matrix(
+    source_a: LatLng,
+    source_b: LatLng,
+    destinations: list[LatLng],
+    client: httpx.AsyncClient | None,
+) -> list[tuple[float, float] | None]:
+    if len(destinations) > MAX_MATRIX_DESTINATIONS:
+        raise ValueError(f"At most {MAX_MATRIX_DESTINATIONS} destinations per request")
 
-async def get_transit_times(
-    source_a: LatLng, source_b: LatLng, destination: LatLng
-) -> tuple[float, float]:
     origins = f"{source_a['lat']},{source_a['lng']}|{source_b['lat']},{source_b['lng']}"
-    destinations = f"{destination['lat']},{destination['lng']}"
+    destinations_param = "|".join(f"{d['lat']},{d['lng']}" for d in destinations)
 
     params = {
         "origins": origins,
-        "destinations": destinations,
+        "destinations": destinations_param,
         "mode": "transit",
         "key": settings.google_places_api_key,
     }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(GOOGLE_DISTANCE_MATRIX_URL, params=params)
+    metrics.incr("routing.api_calls")
+    client = client or get_http_client()
+    resp = await client.get(
+        GOOGLE_DISTANCE_MATRIX_URL,
+        params=params,
+        timeout=upstream_timeout(settings.routing_timeout_s),
+    )
 
     if resp.status_code != 200:
         raise RuntimeError(f"Google Distance Matrix API error: {resp.status_code}")
@@ -32,14 +91,23 @@ async def get_transit_times(
             f"Google Distance Matrix error: {data.get('status')} - {data.get('error_message', '')}"
         )
 
-    element_a = data["rows"][0]["elements"][0]
-    element_b = data["rows"][1]["elements"][0]
+    times: list[tuple[float, float] | None] = []
+    for element_a, element_b in zip(data["rows"][0]["elements"], data["rows"][1]["elements"]):
+        if element_a["status"] != "OK" or element_b["status"] != "OK":
+            times.append(None)
+            continue
+        times.append((element_a["duration"]["value"], element_b["duration"]["value"]))
 
-    if element_a["status"] != "OK" or element_b["status"] != "OK":
-        failed = element_a["status"] if element_a["status"] != "OK" else element_b["status"]
-        raise RuntimeError(f"Distance Matrix element error: {failed}")
+    return times
 
-    time_a: float = element_a["duration"]["value"]
-    time_b: float = element_b["duration"]["value"]
 
-    return time_a, time_b
+async def get_transit_times(
+    source_a: LatLng,
+    source_b: LatLng,
+    destination: LatLng,
+    client: httpx.AsyncClient | None = None,
+) -> tuple[float, float]:
+    (times,) = await get_transit_time_matrix(source_a, source_b, [destination], client)
+    if times is None:
+        raise RuntimeError("Distance Matrix element error: no transit route")
+    return times
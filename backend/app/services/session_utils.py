@@ -1,8 +1,12 @@
 import random
+import time
 
 from nanoid import generate
 
 from app.config import settings
+from app.models import Session
+
+SESSION_TTL_S = 24 * 60 * 60  # 24 hours in seconds
 
 
 def generate_session_id() -> str:
@@ -19,3 +23,13 @@ def get_share_url(session_id: str) -> str:
 
 def generate_pin_code() -> str:
     return str(random.randint(1000, 9999))
+
+
+def touch_session(session: Session) -> None:
+    """Mark a session as changed: refresh updated_at and bump its version in SQL."""
+    session.updated_at = int(time.time())
+    session.version = Session.version + 1
+
+
+def session_etag(session: Session) -> str:
+    return f'"{session.id}-{session.updated_at}-{session.version}"'
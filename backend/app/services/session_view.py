@@ -0,0 +1,98 @@
+from collections.abc import Collection
+from datetime import datetime, timezone
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.models import Session, Venue
+from app.schemas import SessionOut, VenueOut, VoteOut
+from app.services.cache import TTLCache
+
+# Encoded payloads by (session id, version); a version bump makes the old entry unreachable
+payload_cache: TTLCache[bytes] = TTLCache(
+    "session_payload_cache",
+    max_entries=settings.session_payload_cache_max_entries,
+    ttl_s=settings.session_payload_cache_ttl_s,
+)
+
+
+def _alias_map(model: type[BaseModel], exclude: Collection[str] = ()) -> tuple[tuple[str, str], ...]:
+    # (attribute, camelCase key) pairs, resolved once instead of per response
+    return tuple(
+        (name, field.alias or name)
+        for name, field in model.model_fields.items()
+        if name not in exclude
+    )
+
+
+_SESSION_FIELDS = _alias_map(SessionOut, exclude={"created_at", "updated_at", "venues", "votes"})
+# Everything but the shortlist row's own keys comes from the catalog entry
+_PLACE_FIELDS = _alias_map(VenueOut, exclude={"id", "session_id", "google_place_id"})
+_VOTE_FIELDS = _alias_map(VoteOut, exclude={"created_at"})
+
+
+def _iso(v: Any) -> str:
+    # Same output as the schemas' timestamp field_serializers
+    if isinstance(v, int):
+        return datetime.fromtimestamp(v, tz=timezone.utc).isoformat()
+    return str(v)
+
+
+async def load_session_graph(db: AsyncSession, session_id: str) -> Session | None:
+    """Load a session with its venues (and their places) and votes in a single joined query."""
+    result = await db.execute(
+        select(Session)
+        .where(Session.id == session_id)
+        .options(
+            joinedload(Session.venues).joinedload(Venue.place),
+            joinedload(Session.votes),
+        )
+        .execution_options(populate_existing=True)
+    )
+    return result.unique().scalar_one_or_none()
+
+
+def session_view(session: Session) -> dict[str, Any]:
+    """
+    Full client-facing session payload (camelCase), shaped like SessionOut;
+    venues (with places) and votes must be loaded. Built straight from the ORM rows since
+    the data was already validated on the way in.
+    """
+    view = {alias: getattr(session, name) for name, alias in _SESSION_FIELDS}
+    view["createdAt"] = _iso(session.created_at)
+    view["updatedAt"] = _iso(session.updated_at)
+    view["venues"] = [
+        {
+            "id": venue.id,
+            "sessionId": venue.session_id,
+            "googlePlaceId": venue.place_id,
+            **{alias: getattr(venue.place, name) for name, alias in _PLACE_FIELDS},
+        }
+        for venue in session.venues
+    ]
+    view["votes"] = [
+        {**{alias: getattr(vote, name) for name, alias in _VOTE_FIELDS}, "createdAt": _iso(vote.created_at)}
+        for vote in session.votes
+    ]
+    return view
+
+
+def cached_session_payload(session_id: str, version: int) -> bytes | None:
+    return payload_cache.get(f"{session_id}:{version}")
+
+
+def session_payload(session: Session) -> bytes:
+    """Encode the session view as JSON and cache it under (id, version); venues and votes must be loaded."""
+    payload = orjson.dumps(session_view(session))
+    payload_cache.set(f"{session.id}:{session.version}", payload)
+    return payload
+
+
+async def load_session_payload(db: AsyncSession, session_id: str) -> bytes | None:
+    session = await load_session_graph(db, session_id)
+    return session_payload(session) if session else None
@@ -0,0 +1,260 @@
+import csv
+import heapq
+import io
+import logging
+import time
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.services.geocoding import LatLng
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_000
+
+_graph: "TransitGraph | None" = None
+
+
+def _planar_m(lat: np.ndarray, lng: np.ndarray, ref_lat: float) -> np.ndarray:
+    """Equirectangular projection to metres; accurate enough at city scale."""
+    cos_lat = np.cos(np.radians(ref_lat))
+    return np.column_stack(
+        [np.radians(lat) * EARTH_RADIUS_M, np.radians(lng) * EARTH_RADIUS_M * cos_lat]
+    )
+
+
+def _parse_gtfs_time(value: str) -> int:
+    # GTFS times may run past 24:00:00 for trips that cross midnight
+    hours, minutes, seconds = value.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _read_gtfs_table(path: Path, name: str) -> Iterator[dict[str, str]]:
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive, archive.open(name) as raw:
+            yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig"))
+    else:
+        with open(path / name, encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+class TransitGraph:
+    """
+    Stop graph in CSR form (indptr/indices/weights, weights in seconds).
+
+    Ride edges join consecutive stops of every GTFS trip, weighted by the
+    fastest scheduled hop. Walking edges join stops within walk_radius_m and
+    carry a transfer penalty. Schedules are collapsed, so times are
+    frequency-agnostic estimates and Google stays the source of truth.
+    """
+
+    def __init__(
+        self,
+        stop_coords: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        self.stop_coords = stop_coords
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._ref_lat = float(stop_coords[:, 0].mean()) if len(stop_coords) else 0.0
+        self._stop_xy = _planar_m(stop_coords[:, 0], stop_coords[:, 1], self._ref_lat)
+
+    @property
+    def stop_count(self) -> int:
+        return len(self.stop_coords)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    @classmethod
+    def from_gtfs(cls, path: str | Path) -> "TransitGraph":
+        path = Path(path)
+
+        stop_index: dict[str, int] = {}
+        coords: list[tuple[float, float]] = []
+        for row in _read_gtfs_table(path, "stops.txt"):
+            if not row.get("stop_lat") or not row.get("stop_lon"):
+                continue
+            stop_index[row["stop_id"]] = len(coords)
+            coords.append((float(row["stop_lat"]), float(row["stop_lon"])))
+        stop_coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+        trip_index: dict[str, int] = {}
+        trips: list[int] = []
+        sequences: list[int] = []
+        stops: list[int] = []
+        arrivals: list[int] = []
+        departures: list[int] = []
+        for row in _read_gtfs_table(path, "stop_times.txt"):
+            stop = stop_index.get(row["stop_id"])
+            if stop is None or not row.get("arrival_time") or not row.get("departure_time"):
+                continue
+            trips.append(trip_index.setdefault(row["trip_id"], len(trip_index)))
+            sequences.append(int(row["stop_sequence"]))
+            stops.append(stop)
+            arrivals.append(_parse_gtfs_time(row["arrival_time"]))
+            departures.append(_parse_gtfs_time(row["departure_time"]))
+
+        trip_arr = np.array(trips, dtype=np.int64)
+        order = np.lexsort((np.array(sequences, dtype=np.int64), trip_arr))
+        trip_arr = trip_arr[order]
+        stop_arr = np.array(stops, dtype=np.int64)[order]
+        arr_arr = np.array(arrivals, dtype=np.int64)[order]
+        dep_arr = np.array(departures, dtype=np.int64)[order]
+
+        same_trip = trip_arr[1:] == trip_arr[:-1]
+        ride_src = stop_arr[:-1][same_trip]
+        ride_dst = stop_arr[1:][same_trip]
+        ride_w = np.maximum(arr_arr[1:] - dep_arr[:-1], 0)[same_trip].astype(np.float64)
+
+        graph = cls(stop_coords, np.zeros(1, dtype=np.int64), np.zeros(0, np.int32), np.zeros(0))
+        walk_src, walk_dst, walk_w = graph._walking_links()
+
+        graph._set_edges(
+            np.concatenate([ride_src, walk_src]),
+            np.concatenate([ride_dst, walk_dst]),
+            np.concatenate([ride_w, walk_w]),
+        )
+        return graph
+
+    def _walking_links(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        radius = settings.transit_walk_radius_m
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, (x, y) in enumerate(np.floor(self._stop_xy / radius).astype(np.int64)):
+            cells.setdefault((int(x), int(y)), []).append(i)
+
+        src: list[np.ndarray] = []
+        dst: list[np.ndarray] = []
+        dist: list[np.ndarray] = []
+        for (cx, cy), members in cells.items():
+            neighbours = [
+                j
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for j in cells.get((cx + dx, cy + dy), [])
+            ]
+            a = np.array(members)
+            b = np.array(neighbours)
+            d = np.linalg.norm(self._stop_xy[a, None, :] - self._stop_xy[None, b, :], axis=2)
+            ai, bi = np.nonzero((d <= radius) & (a[:, None] != b[None, :]))
+            src.append(a[ai])
+            dst.append(b[bi])
+            dist.append(d[ai, bi])
+
+        if not src:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0)
+
+        walk_s = np.concatenate(dist) / settings.transit_walk_speed_mps
+        return (
+            np.concatenate(src),
+            np.concatenate(dst),
+            walk_s + settings.transit_transfer_penalty_s,
+        )
+
+    def _set_edges(self, src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> None:
+        # Keep only the fastest edge per (src, dst) pair, then pack as CSR
+        order = np.lexsort((weight, dst, src))
+        src, dst, weight = src[order], dst[order], weight[order]
+        first = np.ones(len(src), dtype=bool)
+        first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, weight = src[first], dst[first], weight[first]
+
+        self.indptr = np.zeros(self.stop_count + 1, dtype=np.int64)
+        np.add.at(self.indptr, src + 1, 1)
+        np.cumsum(self.indptr, out=self.indptr)
+        self.indices = dst.astype(np.int32)
+        self.weights = weight.astype(np.float32)
+
+    def _nearby_walk_s(self, points: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """(k, stops) walking seconds from each point to every stop, inf beyond radius."""
+        xy = _planar_m(points[:, 0], points[:, 1], self._ref_lat)
+        d = np.linalg.norm(xy[:, None, :] - self._stop_xy[None, :, :], axis=2)
+        walk = d / settings.transit_walk_speed_mps
+        return np.where(d <= radius, walk, np.inf), xy
+
+    def _dijkstra(self, initial: np.ndarray, cutoff_s: float) -> np.ndarray:
+        """
+        Multi-source Dijkstra for several origins in one pass.
+
+        initial is a (k, stops) array of starting costs (inf where a stop is
+        not an access stop); the result has the same shape.
+        """
+        best = initial.astype(np.float64, copy=True)
+        heap = [(float(best[k, s]), k, int(s)) for k, s in zip(*np.nonzero(np.isfinite(best)))]
+        heapq.heapify(heap)
+
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        while heap:
+            cost, k, stop = heapq.heappop(heap)
+            if cost > best[k, stop] or cost > cutoff_s:
+                continue
+            for edge in range(indptr[stop], indptr[stop + 1]):
+                nxt = indices[edge]
+                new_cost = cost + weights[edge]
+                if new_cost < best[k, nxt]:
+                    best[k, nxt] = new_cost
+                    heapq.heappush(heap, (new_cost, k, int(nxt)))
+        return best
+
+    def travel_times(
+        self, origins: list[LatLng], destinations: np.ndarray, chunk_size: int = 64
+    ) -> np.ndarray:
+        """(len(origins), n) estimated door-to-door seconds to (n, 2) lat/lng destinations."""
+        origin_pts = np.array([[o["lat"], o["lng"]] for o in origins], dtype=np.float64)
+        access, origin_xy = self._nearby_walk_s(origin_pts, settings.transit_access_radius_m)
+        stop_costs = self._dijkstra(
+            access + settings.transit_boarding_penalty_s, settings.transit_max_travel_s
+        )
+
+        reached = np.isfinite(stop_costs).any(axis=0)
+        reached_costs = stop_costs[:, reached]
+        reached_xy = self._stop_xy[reached]
+
+        dest_xy = _planar_m(destinations[:, 0], destinations[:, 1], self._ref_lat)
+        direct_walk = (
+            np.linalg.norm(origin_xy[:, None, :] - dest_xy[None, :, :], axis=2)
+            / settings.transit_walk_speed_mps
+        )
+
+        result = direct_walk.copy()
+        for start in range(0, len(dest_xy), chunk_size):
+            chunk = dest_xy[start : start + chunk_size]
+            d = np.linalg.norm(chunk[:, None, :] - reached_xy[None, :, :], axis=2)
+            egress = np.where(
+                d <= settings.transit_access_radius_m, d / settings.transit_walk_speed_mps, np.inf
+            )
+            # (k, 1, stops) + (1, chunk, stops) -> best stop per (origin, destination)
+            via_transit = (reached_costs[:, None, :] + egress[None, :, :]).min(axis=2, initial=np.inf)
+            result[:, start : start + chunk_size] = np.minimum(
+                result[:, start : start + chunk_size], via_transit
+            )
+
+        return result
+
+
+def load_transit_graph() -> None:
+    global _graph
+    if not settings.transit_gtfs_path:
+        return
+
+    started = time.perf_counter()
+    _graph = TransitGraph.from_gtfs(settings.transit_gtfs_path)
+    logger.info(
+        "Loaded transit graph from %s: %d stops, %d edges in %.1fs",
+        settings.transit_gtfs_path,
+        _graph.stop_count,
+        _graph.edge_count,
+        time.perf_counter() - started,
+    )
+
+
+def get_transit_graph() -> TransitGraph | None:
+    return _graph
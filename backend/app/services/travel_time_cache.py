@@ -0,0 +1,87 @@
+import logging
+import time
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models import TravelTimeCache
+from app.services.cache import TTLCache
+from app.services.geocoding import LatLng, quantize_cell
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_memory: TTLCache[float] = TTLCache(
+    "travel_time_cache",
+    settings.travel_time_cache_max_entries,
+    settings.travel_time_cache_ttl_s,
+)
+
+
+def time_bucket(now: float | None = None) -> int:
+    """Time-of-day bucket (UTC) so peak and off-peak timetables are cached apart."""
+    t = time.gmtime(now if now is not None else time.time())
+    return (t.tm_hour * 60 + t.tm_min) // settings.travel_time_cache_bucket_minutes
+
+
+def leg_key(origin: LatLng, destination: LatLng, mode: str, bucket: int) -> str:
+    precision = settings.travel_time_cache_precision_m
+    return (
+        f"{mode}:{bucket}:{quantize_cell(origin, precision)}>{quantize_cell(destination, precision)}"
+    )
+
+
+async def get_many(keys: list[str]) -> dict[str, float]:
+    if not settings.travel_time_cache_enabled or not keys:
+        return {}
+
+    found: dict[str, float] = {}
+    for key in keys:
+        seconds = _memory.get(key)
+        if seconds is not None:
+            found[key] = seconds
+
+    missing = [k for k in set(keys) if k not in found]
+    if missing and settings.travel_time_cache_persist:
+        min_created_at = int(time.time()) - settings.travel_time_cache_ttl_s
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(TravelTimeCache).where(
+                        TravelTimeCache.key.in_(missing),
+                        TravelTimeCache.created_at >= min_created_at,
+                    )
+                )
+                rows = result.scalars().all()
+        except Exception as e:
+            logger.warning("Travel-time cache lookup failed: %s", e)
+            rows = []
+
+        for row in rows:
+            found[row.key] = row.seconds
+            _memory.set(row.key, row.seconds)
+        metrics.incr("travel_time_cache.db_hit", len(rows))
+        metrics.incr("travel_time_cache.db_miss", len(missing) - len(rows))
+
+    return found
+
+
+async def put_many(items: dict[str, float]) -> None:
+    if not settings.travel_time_cache_enabled or not items:
+        return
+
+    for key, seconds in items.items():
+        _memory.set(key, seconds)
+
+    if not settings.travel_time_cache_persist:
+        return
+
+    now = int(time.time())
+    try:
+        async with async_session_factory() as db:
+            for key, seconds in items.items():
+                await db.merge(TravelTimeCache(key=key, seconds=seconds, created_at=now))
+            await db.commit()
+    except Exception as e:
+        logger.warning("Travel-time cache write failed: %s", e)
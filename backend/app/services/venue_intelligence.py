@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.config import settings
+from app.services.llm_stream import stream_in_batches
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """You are a local restaurant and cafe expert and review analyst. For each venue provided, generate:
+1. A short 2-3 sentence description of what makes this place special
+2. Cuisine tags (e.g., ["Japanese", "Ramen", "Izakaya"])
+3. Vibe tags (e.g., ["Cozy", "Date night", "Trendy"])
+4. Best-for labels (e.g., ["Casual catch-up", "Groups of 2-4"])
+5. A signature dish or drink the place is likely known for
+
+Base these on the venue name, type, location, rating, price level and reviews.
+
+If the venue has reviews, also analyze them:
+1. SENTIMENT: Calculate approximate percentages of positive/neutral/negative sentiment (must sum to 1.0)
+2. STANDOUT DISHES: Identify specific dishes, drinks, or menu items mentioned multiple times or praised highly (be specific - include exact names, max 5 items)
+3. REVIEW SUMMARY: Write 2-3 sentences summarizing what customers love or dislike
+4. HIGHLIGHTS: Extract 3-5 key themes (e.g., "Great for dates", "Fast service", "Can be noisy")
+
+Return a valid JSON array with one object per venue, with this structure:
+[
+  {
+    "id": 0,
+    "name": "...",
+    "description": "...",
+    "cuisineTags": ["Tag 1"],
+    "vibeTags": ["Tag 1"],
+    "bestFor": ["Label 1"],
+    "signatureDish": "...",
+    "reviewAnalysis": {
+      "sentiment": {"positive": 0.7, "neutral": 0.2, "negative": 0.1},
+      "standoutDishes": ["Dish 1", "Dish 2"],
+      "reviewSummary": "...",
+      "highlights": ["Theme 1", "Theme 2"]
+    }
+  }
+]
+
+Copy each venue's "id" from the input unchanged. Set "reviewAnalysis" to null for a venue with no reviews. Return ONLY the JSON array, no markdown formatting or code blocks."""
+
+MODEL = "claude-haiku-4-5-20251001"
+PROMPT_VERSION = hashlib.sha256(f"{MODEL}\n{SYSTEM_PROMPT}".encode()).hexdigest()[:12]
+
+# The system prompt is identical for every request, so it is marked for prompt caching
+SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+ENRICHMENT_KEYS = ("description", "cuisineTags", "vibeTags", "bestFor", "signatureDish")
+
+
+def _review_texts(venue: dict[str, Any]) -> list[str]:
+    # Top 5 reviews that have text
+    texts = []
+    for review in venue.get("reviews", [])[:5]:
+        text = review.get("text", {}).get("text", "")
+        if text:
+            texts.append(f"Rating: {review.get('rating', 0)}/5\n{text}")
+    return texts
+
+
+def _venue_prompt_input(v: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "name": v.get("displayName", {}).get("text", ""),
+        "types": v.get("types", []),
+        "rating": v.get("rating"),
+        "reviewCount": v.get("userRatingCount"),
+        "address": v.get("formattedAddress", ""),
+        "priceLevel": v.get("priceLevel", "UNKNOWN"),
+        "reviews": _review_texts(v),
+    }
+
+
+def intelligence_key(venue: dict[str, Any]) -> str:
+    """Content address of a venue's result: same prompt and same inputs -> same key."""
+    raw = json.dumps([PROMPT_VERSION, _venue_prompt_input(venue)], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _build_user_message(prompt_inputs: list[dict[str, Any]]) -> str:
+    return json.dumps(prompt_inputs, indent=2)
+
+
+def _parse_item(item: dict[str, Any], has_reviews: bool) -> dict[str, Any]:
+    review_analysis = item.get("reviewAnalysis") if has_reviews else None
+    if isinstance(review_analysis, dict):
+        review_analysis = {
+            "sentiment": review_analysis.get("sentiment", {}),
+            "standoutDishes": review_analysis.get("standoutDishes", []),
+            "reviewSummary": review_analysis.get("reviewSummary"),
+            "highlights": review_analysis.get("highlights", []),
+        }
+    else:
+        review_analysis = None
+    return {
+        "enrichment": {key: item.get(key) for key in ENRICHMENT_KEYS},
+        "reviewAnalysis": review_analysis,
+    }
+
+
+async def analyze_venues(
+    venues: list[dict[str, Any]],
+    on_result: Callable[[str, dict[str, Any]], Awaitable[None]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Enrichment and review analysis per Google place id, from one request per batch:
+
+    {
+        "enrichment": {"description": ..., "cuisineTags": [...], "vibeTags": [...],
+                       "bestFor": [...], "signatureDish": ...},
+        "reviewAnalysis": {"sentiment": {...}, "standoutDishes": [...],
+                           "reviewSummary": ..., "highlights": [...]} or None,
+    }
+
+    Results are streamed: on_result is awaited for each venue as soon as its
+    result is available. Callers pass only venues whose stored result is
+    stale (see intelligence_key).
+    """
+    result_map: dict[str, dict[str, Any]] = {}
+
+    if not venues:
+        return result_map
+
+    if not settings.anthropic_api_key:
+        logger.warning("ANTHROPIC_API_KEY not set, skipping venue intelligence")
+        return result_map
+
+    # The model echoes each venue's position as "id"; names are not unique
+    # (two branches of a chain), Google place ids would cost more tokens
+    prompt_inputs = [{"id": i, **_venue_prompt_input(v)} for i, v in enumerate(venues)]
+    metrics.incr("llm.intelligence.venues_sent", len(prompt_inputs))
+
+    async def on_item(item: dict[str, Any]) -> None:
+        try:
+            index = int(item.get("id"))
+        except (TypeError, ValueError):
+            return
+        if not 0 <= index < len(venues) or venues[index]["id"] in result_map:
+            return
+        place_id = venues[index]["id"]
+        result_map[place_id] = _parse_item(item, bool(prompt_inputs[index]["reviews"]))
+        if on_result:
+            await on_result(place_id, result_map[place_id])
+
+    missing = await stream_in_batches(
+        prompt_inputs,
+        model=MODEL,
+        max_tokens=8192,
+        system=SYSTEM_BLOCKS,
+        build_message=_build_user_message,
+        is_done=lambda p: venues[p["id"]]["id"] in result_map,
+        on_item=on_item,
+        metric="llm.intelligence",
+    )
+    if missing:
+        logger.error("Venue intelligence incomplete after retrying: %d venues missing", len(missing))
+
+    return result_map
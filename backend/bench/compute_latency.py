@@ -0,0 +1,116 @@
+"""
+Per-/compute upstream latency: a fresh connection per Google call versus the
+shared pooled client, against a local stub of the Google APIs.
+
+Runs the network part of a compute (fair midpoint + venue search) for
+--computes random pin pairs, with the travel-time and Places caches off so
+every compute goes upstream. The stub delays each new connection by
+--connect-ms to stand in for the TCP + TLS handshake.
+
+    cd backend && python -m bench.compute_latency [--connect-ms 60] [--request-ms 20]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from bench.stubs import StubGoogleServer, StubTransport, use_temp_database
+
+use_temp_database(
+    "compute-latency",
+    PLACES_CACHE_ENABLED="false",
+    TRAVEL_TIME_CACHE_ENABLED="false",
+    HTTP2_ENABLED="false",
+)
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import dispose_engines, run_migrations  # noqa: E402
+from app.services import http_client  # noqa: E402
+from app.services.midpoint import find_fair_midpoint  # noqa: E402
+from app.services.places import search_venues  # noqa: E402
+
+
+def _client(port: int, keepalive: bool) -> httpx.AsyncClient:
+    # Without keep-alive every request opens its own connection, which is what
+    # a new AsyncClient per call amounted to
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections if keepalive else 0,
+        keepalive_expiry=settings.http_keepalive_expiry_s,
+    )
+    return httpx.AsyncClient(
+        transport=StubTransport(port, limits=limits),
+        timeout=httpx.Timeout(10.0, connect=settings.http_connect_timeout_s),
+    )
+
+
+async def _compute(rng: random.Random) -> None:
+    a = {"lat": -33.87 + rng.uniform(-0.05, 0.05), "lng": 151.2 + rng.uniform(-0.05, 0.05)}
+    b = {"lat": -33.80 + rng.uniform(-0.05, 0.05), "lng": 151.1 + rng.uniform(-0.05, 0.05)}
+    result = await find_fair_midpoint(a, b)
+    await search_venues(result.midpoint)
+
+
+async def _run(mode: str, server: StubGoogleServer, computes: int, seed: int) -> dict:
+    http_client._client = _client(server.port, keepalive=mode == "shared")
+    server.connections = server.requests = 0
+    rng = random.Random(seed)
+    timings = []
+    try:
+        for _ in range(computes):
+            started = time.perf_counter()
+            await _compute(rng)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        await http_client.close_http_client()
+    timings.sort()
+    return {
+        "mode": mode,
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "requests": server.requests / computes,
+        "connections": server.connections / computes,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--computes", type=int, default=50)
+    parser.add_argument("--connect-ms", type=float, default=60.0)
+    parser.add_argument("--request-ms", type=float, default=20.0)
+    parser.add_argument("--midpoint-engine", default=settings.midpoint_engine)
+    parser.add_argument("--places-mode", default=settings.places_search_mode)
+    args = parser.parse_args()
+    settings.midpoint_engine = args.midpoint_engine
+    settings.places_search_mode = args.places_mode
+
+    await run_migrations()
+    server = StubGoogleServer(args.connect_ms, args.request_ms)
+    await server.start()
+    try:
+        # Warm-up so imports and the first SQLite writes are not timed
+        await _run("shared", server, 2, seed=0)
+        print(
+            f"{args.computes} computes, engine={args.midpoint_engine}, places={args.places_mode}, "
+            f"connect={args.connect_ms:.0f}ms, request={args.request_ms:.0f}ms"
+        )
+        print(f"{'mode':<10} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'req/compute':>12} {'conn/compute':>13}")
+        # Different pins per mode, so the second run gets no road-snap cache hits
+        for seed, mode in enumerate(("per_call", "shared"), start=1):
+            r = await _run(mode, server, args.computes, seed=seed)
+            print(
+                f"{r['mode']:<10} {r['mean_ms']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                f"{r['requests']:>12.1f} {r['connections']:>13.1f}"
+            )
+    finally:
+        await server.stop()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
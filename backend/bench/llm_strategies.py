@@ -0,0 +1,126 @@
+"""
+Venue intelligence per LLM execution strategy (batch / chunked / per_venue)
+against a local stub of the Anthropic Messages API that streams results
+with a fixed time to first token and per-venue generation time.
+
+For each strategy, runs analyze_venues over the shortlist once cleanly and
+once with the first request failing mid-stream (an overloaded error after
+--fail-after results), and reports wall-clock time, time to the first
+result, tokens billed and how many venues the failure sent back for a
+retry.
+
+    cd backend && python -m bench.llm_strategies [--venues 8] [--ttft-ms 400] [--item-ms 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from bench.stubs import StubAnthropicServer, bench_places, use_temp_database
+
+use_temp_database("llm-strategies", ANTHROPIC_API_KEY="bench")
+
+import anthropic  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services import llm_client  # noqa: E402
+from app.services.metrics import metrics  # noqa: E402
+from app.services.venue_intelligence import analyze_venues  # noqa: E402
+
+STRATEGIES = ("batch", "chunked", "per_venue")
+METRIC = "llm.intelligence"
+COUNTERS = ("requests", "failed_requests", "venues_retried")
+
+
+async def _run(strategy: str, server: StubAnthropicServer, venues: list[dict]) -> dict:
+    settings.llm_execution_strategy = strategy
+    llm_client._client = anthropic.AsyncAnthropic(
+        api_key="bench", base_url=f"http://127.0.0.1:{server.port}"
+    )
+    server.requests = 0
+    before = metrics.snapshot()["counters"]
+    first: list[float] = []
+
+    async def on_result(place_id: str, result: dict) -> None:
+        if not first:
+            first.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        results = await analyze_venues(venues, on_result=on_result)
+    finally:
+        await llm_client.close_anthropic_client()
+    elapsed = time.perf_counter() - started
+
+    after = metrics.snapshot()["counters"]
+    row = {
+        name: after.get(f"{METRIC}.{name}", 0) - before.get(f"{METRIC}.{name}", 0)
+        for name in COUNTERS
+    }
+    # Tokens as billed by the stub: the app only records usage of completed streams
+    row.update(server.billed)
+    row.update(
+        wall_s=elapsed,
+        first_s=first[0] if first else float("nan"),
+        missing=len(venues) - len(results),
+    )
+    return row
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--venues", type=int, default=8)
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--item-ms", type=float, default=500.0)
+    parser.add_argument("--chunk-size", type=int, default=settings.llm_chunk_size)
+    parser.add_argument("--concurrency", type=int, default=settings.llm_max_concurrency)
+    parser.add_argument(
+        "--fail-after", type=int, default=2, help="results streamed before the failure (at most)"
+    )
+    parser.add_argument(
+        "--min-cache-tokens",
+        type=int,
+        default=2048,
+        help="shortest system prompt the stub caches (the model's minimum cacheable length)",
+    )
+    args = parser.parse_args()
+    settings.llm_chunk_size = args.chunk_size
+    settings.llm_max_concurrency = args.concurrency
+    logging.disable(logging.ERROR)
+
+    venues = bench_places(-33.87, 151.2)[: args.venues]
+    print(
+        f"{len(venues)} venues, ttft={args.ttft_ms:.0f}ms, {args.item_ms:.0f}ms/venue, "
+        f"chunk={args.chunk_size}, concurrency={args.concurrency}"
+    )
+    print(
+        f"{'strategy':<10} {'scenario':<9} {'wall s':>7} {'first s':>8} {'reqs':>5} "
+        f"{'in tok':>7} {'cache w':>8} {'cache r':>8} {'out tok':>8} "
+        f"{'failed':>7} {'retried':>8} {'missing':>8}"
+    )
+    for strategy in STRATEGIES:
+        for scenario, fail_request in (("clean", None), ("1 failure", 1)):
+            server = StubAnthropicServer(
+                args.ttft_ms,
+                args.item_ms,
+                args.min_cache_tokens,
+                fail_request=fail_request,
+                fail_after_items=args.fail_after,
+            )
+            await server.start()
+            try:
+                r = await _run(strategy, server, venues)
+            finally:
+                await server.stop()
+            print(
+                f"{strategy:<10} {scenario:<9} {r['wall_s']:>7.2f} {r['first_s']:>8.2f} "
+                f"{r['requests']:>5} {r['input_tokens']:>7} "
+                f"{r['cache_creation_input_tokens']:>8} {r['cache_read_input_tokens']:>8} "
+                f"{r['output_tokens']:>8} {r['failed_requests']:>7} {r['venues_retried']:>8} "
+                f"{r['missing']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
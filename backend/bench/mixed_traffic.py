@@ -0,0 +1,110 @@
+"""
+Mixed session traffic: concurrent GET /api/sessions/{id} polls interleaved
+with both votes of every session, through the ASGI app, once per SQLite
+profile (the profile is read at import time, so each runs in its own
+process).
+
+    cd backend && python -m bench.mixed_traffic [--sessions 200] [--gets 1600] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.stubs import seed_voting_sessions, use_temp_database
+
+PROFILES = ("default", "performance")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.database import dispose_engines, run_migrations
+    from app.main import app
+    from app.services.events import start_broker, stop_broker
+
+    logging.disable(logging.WARNING)
+    await run_migrations()
+    await start_broker()
+    session_ids = await seed_voting_sessions(args.sessions)
+
+    rng = random.Random(args.seed)
+    ops = [("get", rng.choice(session_ids), "") for _ in range(args.gets)]
+    ops += [
+        ("vote", session_id, voter) for session_id in session_ids for voter in ("user_a", "user_b")
+    ]
+    rng.shuffle(ops)
+
+    latencies: dict[str, list[float]] = {"get": [], "vote": []}
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def one(kind: str, session_id: str, voter: str) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                if kind == "get":
+                    response = await client.get(f"/api/sessions/{session_id}")
+                else:
+                    response = await client.post(
+                        f"/api/sessions/{session_id}/vote",
+                        json={"venueId": f"{session_id}-v0", "voter": voter},
+                    )
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 500:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(*op) for op in ops))
+        elapsed = time.perf_counter() - started
+
+    await stop_broker()
+    await dispose_engines()
+
+    row = f"{args.profile:<12} {len(ops) / elapsed:>8.0f}"
+    for kind in ("get", "vote"):
+        timings = sorted(latencies[kind])
+        row += f" {statistics.median(timings):>9.1f} {timings[int(len(timings) * 0.95) - 1]:>9.1f}"
+    print(f"{row} {errors:>5}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--gets", type=int, default=1600)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", choices=PROFILES, help="run one profile in this process")
+    args = parser.parse_args()
+
+    if args.profile:
+        use_temp_database(f"mixed-traffic-{args.profile}", SQLITE_PROFILE=args.profile)
+        asyncio.run(_run(args))
+        return
+
+    print(
+        f"{args.sessions} sessions, {args.gets} GETs + {args.sessions * 2} votes, "
+        f"concurrency {args.concurrency}"
+    )
+    print(
+        f"{'profile':<12} {'req/s':>8} {'GET p50':>9} {'GET p95':>9} "
+        f"{'vote p50':>9} {'vote p95':>9} {'5xx':>5}"
+    )
+    for profile in PROFILES:
+        subprocess.run(
+            [sys.executable, "-m", "bench.mixed_traffic", *sys.argv[1:], "--profile", profile],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+SQL statements issued per request by the session endpoints, counted with a
+cursor-execute listener while the requests run through the ASGI app.
+
+Covers GET /api/sessions/{id} when the payload has to be rebuilt, when it
+is served from the payload cache and when the client's ETag still matches,
+and both votes of a session (the second one decides the winner). Every
+count includes the statements publish_session runs to push the update.
+
+    cd backend && python -m bench.query_counts [--verbose]
+"""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from bench.stubs import seed_voting_sessions, use_temp_database
+
+use_temp_database("query-counts")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import dispose_engines, engine, read_engine, run_migrations  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.events import start_broker, stop_broker  # noqa: E402
+from app.services.session_view import payload_cache  # noqa: E402
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(" ".join(statement.split()))
+
+    def install(self) -> None:
+        for target in {engine.sync_engine, read_engine.sync_engine}:
+            event.listen(target, "before_cursor_execute", self)
+
+
+async def _measure(
+    counter: StatementCounter, request: Callable[[], Awaitable[httpx.Response]]
+) -> tuple[int, list[str]]:
+    counter.statements.clear()
+    response = await request()
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.status_code}: {response.text}")
+    return response.status_code, list(counter.statements)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--verbose", action="store_true", help="print every statement")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    await run_migrations()
+    await start_broker()
+    (session_id,) = await seed_voting_sessions(1)
+    counter = StatementCounter()
+    counter.install()
+
+    url = f"/api/sessions/{session_id}"
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        cold = await client.get(url)
+        etag = cold.headers["etag"]
+        cases = [
+            ("GET session (payload rebuilt)", lambda: client.get(url)),
+            ("GET session (payload cache hit)", lambda: client.get(url)),
+            (
+                "GET session (If-None-Match, 304)",
+                lambda: client.get(url, headers={"If-None-Match": etag}),
+            ),
+            (
+                "POST vote (first voter)",
+                lambda: client.post(
+                    f"{url}/vote", json={"venueId": f"{session_id}-v0", "voter": "user_a"}
+                ),
+            ),
+            (
+                "POST vote (deciding voter)",
+                lambda: client.post(
+                    f"{url}/vote", json={"venueId": f"{session_id}-v1", "voter": "user_b"}
+                ),
+            ),
+        ]
+        # The GET above warmed up the app; drop its cache entry so the first
+        # case measures a rebuild
+        payload_cache.clear()
+
+        print(f"{'request':<36} {'status':>6} {'statements':>11}")
+        for label, request in cases:
+            status, statements = await _measure(counter, request)
+            print(f"{label:<36} {status:>6} {len(statements):>11}")
+            if args.verbose:
+                for statement in statements:
+                    print(f"    {statement[:140]}")
+
+    await stop_broker()
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
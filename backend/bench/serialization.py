@@ -0,0 +1,97 @@
+"""
+Encoding one GET /api/sessions/{id} payload for an 8-venue, 2-vote session:
+pydantic SessionOut validation + FastAPI's JSONResponse (the response_model
+path), the alias-map view + orjson the endpoint uses now, and a hit in the
+encoded payload cache. Database time is excluded: the session graph is
+loaded once up front.
+
+    cd backend && python -m bench.serialization [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+
+from bench.stubs import seed_voting_sessions, use_temp_database
+
+use_temp_database("serialization")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.database import (  # noqa: E402
+    async_session_factory,
+    dispose_engines,
+    run_migrations,
+)
+from app.models import Session  # noqa: E402
+from app.schemas import SessionOut, VenueOut  # noqa: E402
+from app.services.session_view import (  # noqa: E402
+    cached_session_payload,
+    load_session_graph,
+    session_payload,
+)
+
+_SESSION_COLUMNS = [name for name in SessionOut.model_fields if name not in {"venues", "votes"}]
+_PLACE_COLUMNS = [
+    name for name in VenueOut.model_fields if name not in {"id", "session_id", "google_place_id"}
+]
+
+
+def _pydantic(session: Session) -> bytes:
+    data = SessionOut.model_validate(
+        {
+            **{name: getattr(session, name) for name in _SESSION_COLUMNS},
+            "venues": [
+                {
+                    "id": venue.id,
+                    "session_id": venue.session_id,
+                    "google_place_id": venue.place_id,
+                    **{name: getattr(venue.place, name) for name in _PLACE_COLUMNS},
+                }
+                for venue in session.venues
+            ],
+            "votes": session.votes,
+        },
+        from_attributes=True,
+    )
+    return JSONResponse(jsonable_encoder(data, by_alias=True)).body
+
+
+def _orjson(session: Session) -> bytes:
+    return session_payload(session)
+
+
+def _cache_hit(session: Session) -> bytes:
+    return cached_session_payload(session.id, session.version)
+
+
+ENCODERS = {"pydantic": _pydantic, "orjson": _orjson, "cache hit": _cache_hit}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    await run_migrations()
+    (session_id,) = await seed_voting_sessions(1, venues=8, votes=2)
+    async with async_session_factory() as db:
+        session = await load_session_graph(db, session_id)
+    await dispose_engines()
+
+    # All three must produce the same document
+    reference = json.loads(_pydantic(session))
+    for name, encode in ENCODERS.items():
+        assert json.loads(encode(session)) == reference, f"{name} payload differs"
+
+    print(f"{len(session.venues)} venues, {len(session.votes)} votes, {args.iterations} iterations")
+    print(f"{'encoder':<10} {'us/payload':>11} {'bytes':>7}")
+    for name, encode in ENCODERS.items():
+        seconds = min(timeit.repeat(lambda: encode(session), number=args.iterations, repeat=3))
+        print(f"{name:<10} {seconds / args.iterations * 1e6:>11.1f} {len(encode(session)):>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,458 @@
+"""
+Shared pieces for the benchmarks: a throwaway database and local stubs of
+the Google endpoints the compute pipeline calls and of the Anthropic
+Messages API.
+
+Benchmarks must call use_temp_database() before importing anything from
+app, since settings are read at import time.
+"""
+
+import asyncio
+import json
+import math
+import os
+import tempfile
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+BENCH_PLACES = 20
+
+
+def use_temp_database(name: str, **env: str) -> str:
+    """Point the app at a fresh SQLite file (plus any extra settings env vars)."""
+    path = os.path.join(tempfile.gettempdir(), f"halfway-bench-{name}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("GOOGLE_PLACES_API_KEY", "bench")
+    os.environ.setdefault("SESSION_REAPER_ENABLED", "false")
+    os.environ.update(env)
+    return path
+
+
+def _offset(lat: float, lng: float, north_m: float, east_m: float) -> tuple[float, float]:
+    return (
+        lat + north_m / 111_320,
+        lng + east_m / (111_320 * math.cos(math.radians(lat))),
+    )
+
+
+def bench_places(lat: float, lng: float, radius: float | None = None) -> list[dict[str, Any]]:
+    """
+    BENCH_PLACES well-rated places spiralling out to ~4.9 km from the centre,
+    sparse enough that the venue search widens its radius once.
+    """
+    places = []
+    for i in range(BENCH_PLACES):
+        distance = 100 + i * 250
+        if radius is not None and distance > radius:
+            continue
+        angle = i * 2.4
+        plat, plng = _offset(lat, lng, distance * math.cos(angle), distance * math.sin(angle))
+        places.append(
+            {
+                "id": f"place-{round(lat, 4)}-{round(lng, 4)}-{i}",
+                "displayName": {"text": f"Bench Cafe {i}"},
+                "formattedAddress": f"{i} Bench Street",
+                "location": {"latitude": plat, "longitude": plng},
+                "rating": 4.2 + (i % 7) / 10,
+                "userRatingCount": 80 + i * 13,
+                "priceLevel": "PRICE_LEVEL_MODERATE",
+                "types": ["cafe", "restaurant", "food"],
+                "googleMapsUri": f"https://maps.example/{i}",
+                "editorialSummary": {"text": "Neighbourhood cafe with a long counter."},
+                "reviews": [
+                    {
+                        "rating": 5 - (j % 2),
+                        "text": {"text": f"Review {j}: great flat whites and a friendly team. " * 3},
+                    }
+                    for j in range(5)
+                ],
+            }
+        )
+    return places
+
+
+def google_answer(method: str, url: str, body: bytes) -> dict[str, Any]:
+    """JSON body the stub returns for one Geocoding / Distance Matrix / Places request."""
+    parts = urlsplit(url)
+    params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+    if "geocode" in parts.path:
+        lat, lng = map(float, params["latlng"].split(","))
+        return {
+            "status": "OK",
+            "results": [
+                {
+                    "formatted_address": "1 Stub Road",
+                    "geometry": {"location": {"lat": lat, "lng": lng}},
+                }
+            ],
+        }
+    if "distancematrix" in parts.path:
+        rows = []
+        for origin in params["origins"].split("|"):
+            olat, olng = map(float, origin.split(","))
+            elements = []
+            for dest in params["destinations"].split("|"):
+                dlat, dlng = map(float, dest.split(","))
+                seconds = int(math.hypot(olat - dlat, olng - dlng) * 111_320 / 6) + 300
+                elements.append({"status": "OK", "duration": {"value": seconds}})
+            rows.append({"elements": elements})
+        return {"status": "OK", "rows": rows}
+    if method == "POST" and "searchNearby" in parts.path:
+        circle = json.loads(body)["locationRestriction"]["circle"]
+        center = circle["center"]
+        return {"places": bench_places(center["latitude"], center["longitude"], circle["radius"])}
+    return {"error": f"no stub for {method} {parts.path}"}
+
+
+async def seed_voting_sessions(count: int, venues: int = 8, votes: int = 0) -> list[str]:
+    """
+    Insert count sessions in the voting phase, each shortlisting `venues`
+    fully enriched catalog places, plus the first `votes` (0-2) votes.
+    Returns the session ids; venue ids are f"{session_id}-v{rank}".
+    """
+    import time
+
+    from app.database import async_session_factory
+    from app.models import Place, Session, Venue, Vote
+    from app.services.compute_pipeline import _enrichment_values, _place_row, _review_values
+
+    now = int(time.time())
+    enrichment = {
+        "description": "A relaxed neighbourhood cafe with long communal tables.",
+        "cuisineTags": ["Cafe", "Brunch"],
+        "vibeTags": ["Cosy", "Buzzy"],
+        "bestFor": ["Catch-ups", "Laptop work"],
+        "signatureDish": "Ricotta hotcakes",
+    }
+    review_analysis = {
+        "sentiment": {"positive": 0.8, "neutral": 0.15, "negative": 0.05},
+        "standoutDishes": ["Flat white", "Ricotta hotcakes"],
+        "reviewSummary": "Reviewers praise the coffee and the friendly team.",
+        "highlights": ["Great coffee", "Friendly staff", "Gets busy at weekends"],
+    }
+    places = bench_places(-33.87, 151.2)[:venues]
+    session_ids = [f"bench-{i}" for i in range(count)]
+    async with async_session_factory() as db:
+        for place in places:
+            db.add(
+                Place(
+                    **_place_row(place, now),
+                    **_enrichment_values(enrichment),
+                    **_review_values(review_analysis),
+                )
+            )
+        for session_id in session_ids:
+            db.add(
+                Session(
+                    id=session_id,
+                    status="voting",
+                    user_a_lat=-33.87,
+                    user_a_lng=151.2,
+                    user_a_label="1 Stub Road",
+                    user_b_lat=-33.80,
+                    user_b_lng=151.1,
+                    user_b_label="2 Stub Road",
+                    midpoint_lat=-33.835,
+                    midpoint_lng=151.15,
+                    user_a_travel_time=1500,
+                    user_b_travel_time=1560,
+                    travel_mode="transit",
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        await db.flush()
+        for session_id in session_ids:
+            for rank, place in enumerate(places):
+                db.add(
+                    Venue(
+                        id=f"{session_id}-v{rank}",
+                        session_id=session_id,
+                        place_id=place["id"],
+                        rank=rank,
+                    )
+                )
+        await db.flush()
+        for session_id in session_ids:
+            for voter in ("user_a", "user_b")[:votes]:
+                db.add(
+                    Vote(
+                        id=f"{session_id}-{voter}",
+                        session_id=session_id,
+                        venue_id=f"{session_id}-v0",
+                        voter=voter,
+                        created_at=now,
+                    )
+                )
+        await db.commit()
+    return session_ids
+
+
+class StubHTTPServer:
+    """
+    Minimal keep-alive HTTP/1.1 server on a free local port. Every new
+    connection waits connect_ms before it is served, standing in for the
+    TCP + TLS handshake round trips of a real upstream. Subclasses write
+    the response in respond().
+    """
+
+    def __init__(self, connect_ms: float = 0.0) -> None:
+        self.connect_s = connect_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def respond(
+        self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        raise NotImplementedError
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_s)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode().split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {
+                    k.strip().lower(): v.strip()
+                    for k, _, v in (line.partition(":") for line in header_lines if line)
+                }
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await self.respond(method, target, body, writer)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+class StubGoogleServer(StubHTTPServer):
+    """Answers like the Google APIs, after request_ms per request."""
+
+    def __init__(self, connect_ms: float, request_ms: float) -> None:
+        super().__init__(connect_ms)
+        self.request_s = request_ms / 1000
+
+    async def respond(
+        self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        await asyncio.sleep(self.request_s)
+        payload = json.dumps(google_answer(method, target, body)).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+
+
+def _tokens(text: str) -> int:
+    # Rough English/JSON average
+    return max(1, len(text) // 4)
+
+
+def stub_venue_result(venue: dict[str, Any]) -> dict[str, Any]:
+    """A plausible merged enrichment + review-analysis object for one prompt input."""
+    return {
+        # Echo whichever identifying keys the prompt sent
+        **{key: venue[key] for key in ("id", "name") if key in venue},
+        "description": f"{venue.get('name', 'This venue')} is a relaxed local favourite "
+        "with a long counter, friendly staff and a short seasonal menu.",
+        "cuisineTags": ["Cafe", "Brunch", "Coffee"],
+        "vibeTags": ["Cosy", "Buzzy"],
+        "bestFor": ["Casual catch-up", "Groups of 2-4"],
+        "signatureDish": "Ricotta hotcakes",
+        "reviewAnalysis": (
+            {
+                "sentiment": {"positive": 0.8, "neutral": 0.15, "negative": 0.05},
+                "standoutDishes": ["Flat white", "Ricotta hotcakes"],
+                "reviewSummary": "Reviewers love the coffee and the team; weekends get busy.",
+                "highlights": ["Great coffee", "Friendly staff", "Busy at weekends"],
+            }
+            if venue.get("reviews")
+            else None
+        ),
+    }
+
+
+class StubAnthropicServer(StubHTTPServer):
+    """
+    Streams Messages API answers (server-sent events) for the venue
+    intelligence prompt: the user message is a JSON array of venues and the
+    reply is a JSON array with one result per venue.
+
+    Timing: ttft_ms before the first token of every request (queueing +
+    prefill), then item_ms per venue generated. Usage: input tokens are
+    estimated from the text; a system prompt marked with cache_control and
+    at least min_cache_tokens long is written to the cache by the first
+    request that sends it and read by later ones. Failure: the fail_request-th
+    request (1-based) ends with an overloaded error event after streaming
+    fail_after_items results.
+    """
+
+    def __init__(
+        self,
+        ttft_ms: float,
+        item_ms: float,
+        min_cache_tokens: int,
+        fail_request: int | None = None,
+        fail_after_items: int = 0,
+    ) -> None:
+        super().__init__()
+        self.ttft_s = ttft_ms / 1000
+        self.item_s = item_ms / 1000
+        self.min_cache_tokens = min_cache_tokens
+        self.fail_request = fail_request
+        self.fail_after_items = fail_after_items
+        self._cached: set[str] = set()
+        self.billed = dict.fromkeys(
+            (
+                "input_tokens",
+                "cache_creation_input_tokens",
+                "cache_read_input_tokens",
+                "output_tokens",
+            ),
+            0,
+        )
+
+    def _usage(self, system: str | list[dict[str, Any]], user_message: str) -> dict[str, int]:
+        blocks = [{"text": system}] if isinstance(system, str) else system
+        usage = {"input_tokens": _tokens(user_message)}
+        cache_write = cache_read = 0
+        for block in blocks:
+            tokens = _tokens(block["text"])
+            if "cache_control" in block and tokens >= self.min_cache_tokens:
+                if block["text"] in self._cached:
+                    cache_read += tokens
+                else:
+                    self._cached.add(block["text"])
+                    cache_write += tokens
+            else:
+                usage["input_tokens"] += tokens
+        usage["cache_creation_input_tokens"] = cache_write
+        usage["cache_read_input_tokens"] = cache_read
+        return usage
+
+    async def respond(
+        self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        request_number = self.requests
+        request = json.loads(body)
+        user_message = request["messages"][0]["content"]
+        venues = json.loads(user_message)
+        usage = self._usage(request["system"], user_message)
+        for name, tokens in usage.items():
+            self.billed[name] += tokens
+        fail_at = (
+            min(self.fail_after_items, len(venues) - 1) if request_number == self.fail_request else None
+        )
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        def event(name: str, data: dict[str, Any]) -> None:
+            chunk = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+
+        def text(delta: str) -> None:
+            event(
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": delta},
+                },
+            )
+
+        await asyncio.sleep(self.ttft_s)
+        event(
+            "message_start",
+            {
+                "type": "message_start",
+                "message": {
+                    "id": f"msg_bench_{request_number}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["model"],
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {**usage, "output_tokens": 1},
+                },
+            },
+        )
+        event(
+            "content_block_start",
+            {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            },
+        )
+        text("[")
+        output = "["
+        for i, venue in enumerate(venues):
+            if i == fail_at:
+                self.billed["output_tokens"] += _tokens(output)
+                event(
+                    "error",
+                    {
+                        "type": "error",
+                        "error": {"type": "overloaded_error", "message": "Overloaded"},
+                    },
+                )
+                break
+            await asyncio.sleep(self.item_s)
+            item = ("," if i else "") + json.dumps(stub_venue_result(venue), indent=2)
+            output += item
+            # A few deltas per item, split mid-token like real streaming
+            step = max(1, len(item) // 3)
+            for start in range(0, len(item), step):
+                text(item[start : start + step])
+            await writer.drain()
+        else:
+            text("]")
+            output += "]"
+            self.billed["output_tokens"] += _tokens(output)
+            event("content_block_stop", {"type": "content_block_stop", "index": 0})
+            event(
+                "message_delta",
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": _tokens(output)},
+                },
+            )
+            event("message_stop", {"type": "message_stop"})
+        writer.write(b"0\r\n\r\n")
+
+
+class StubTransport(httpx.AsyncHTTPTransport):
+    """Sends every request to the local stub server instead of the real upstream host."""
+
+    def __init__(self, port: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._port = port
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self._port)
+        return await super().handle_async_request(request)
@@ -0,0 +1,124 @@
+"""
+Storing a compute's shortlist: ORM unit-of-work (merge each catalog place,
+add each venue) versus the pipeline's bulk statements (one multi-row
+upsert into places, one executemany insert into venues).
+
+    cd backend && python -m bench.venue_insert [--sessions 200] [--venues 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench.stubs import bench_places, use_temp_database
+
+use_temp_database("venue-insert")
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.database import (  # noqa: E402
+    async_session_factory,
+    dialect_insert,
+    dispose_engines,
+    run_migrations,
+)
+from app.models import Place, Session, Venue  # noqa: E402
+from app.services.compute_pipeline import _place_row  # noqa: E402
+
+
+async def _store_orm(session_id: str, place_rows: list[dict]) -> None:
+    async with async_session_factory() as db:
+        for row in place_rows:
+            await db.merge(Place(**row))
+        db.add_all(
+            Venue(
+                id=f"{session_id}-v{rank}",
+                session_id=session_id,
+                place_id=row["google_place_id"],
+                rank=rank,
+            )
+            for rank, row in enumerate(place_rows)
+        )
+        await db.commit()
+
+
+async def _store_bulk(session_id: str, place_rows: list[dict]) -> None:
+    async with async_session_factory() as db:
+        insert = dialect_insert(db)
+        stmt = insert(Place).values(place_rows)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["google_place_id"],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in place_rows[0]
+                    if column != "google_place_id"
+                },
+            )
+        )
+        await db.execute(
+            insert(Venue),
+            [
+                {
+                    "id": f"{session_id}-v{rank}",
+                    "session_id": session_id,
+                    "place_id": row["google_place_id"],
+                    "rank": rank,
+                }
+                for rank, row in enumerate(place_rows)
+            ],
+        )
+        await db.commit()
+
+
+STRATEGIES = {"orm": _store_orm, "bulk": _store_bulk}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--venues", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    await run_migrations()
+    now = int(time.time())
+    session_ids = [f"bench-{i}" for i in range(args.sessions)]
+    async with async_session_factory() as db:
+        db.add_all(
+            Session(
+                id=session_id,
+                status="computing",
+                user_a_lat=-33.87,
+                user_a_lng=151.2,
+                travel_mode="transit",
+                created_at=now,
+                updated_at=now,
+            )
+            for session_id in session_ids
+        )
+        await db.commit()
+
+    # Nearby sessions share most of their places, so after the first session
+    # nearly every place write is an update of an existing catalog row
+    place_rows = [_place_row(place, now) for place in bench_places(-33.87, 151.2)[: args.venues]]
+
+    print(f"{args.sessions} sessions x {args.venues} venues")
+    print(f"{'strategy':<8} {'round':>5} {'ms/session':>11}")
+    for round_ in range(1, args.rounds + 1):
+        for name, store in STRATEGIES.items():
+            async with async_session_factory() as db:
+                await db.execute(delete(Venue))
+                await db.execute(delete(Place))
+                await db.commit()
+            started = time.perf_counter()
+            for session_id in session_ids:
+                await store(session_id, place_rows)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<8} {round_:>5} {elapsed / args.sessions * 1000:>11.2f}")
+
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
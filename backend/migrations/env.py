@@ -0,0 +1,61 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes migrations
+MIGRATION_LOCK_KEY = 7_271_101
+
+
+def do_run_migrations(connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        # Every uvicorn worker migrates on startup: one at a time, the others
+        # wait here and then find the schema already at head. Released when
+        # the migration transaction ends.
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER most constraints in place
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    engine = create_async_engine(settings.database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif (connection := config.attributes.get("connection")) is not None:
+    # Invoked from app.database.run_migrations on the app's own engine
+    do_run_migrations(connection)
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    asyncio.run(run_async_migrations())
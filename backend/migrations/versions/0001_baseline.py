@@ -0,0 +1,169 @@
+"""Baseline schema
+
+Creates every table the app used before migrations existed. Databases
+created by the old create_all() path are adopted as-is: existing tables
+are skipped and only the sessions.version column is added if missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+
+    if "sessions" not in existing:
+        op.create_table(
+            "sessions",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("user_a_lat", sa.Float(), nullable=False),
+            sa.Column("user_a_lng", sa.Float(), nullable=False),
+            sa.Column("user_a_label", sa.Text(), nullable=True),
+            sa.Column("user_b_lat", sa.Float(), nullable=True),
+            sa.Column("user_b_lng", sa.Float(), nullable=True),
+            sa.Column("user_b_label", sa.Text(), nullable=True),
+            sa.Column("midpoint_lat", sa.Float(), nullable=True),
+            sa.Column("midpoint_lng", sa.Float(), nullable=True),
+            sa.Column("user_a_travel_time", sa.Integer(), nullable=True),
+            sa.Column("user_b_travel_time", sa.Integer(), nullable=True),
+            sa.Column("travel_mode", sa.String(), nullable=False),
+            sa.Column("winner_venue_id", sa.String(), nullable=True),
+            sa.Column("pin_code", sa.String(), nullable=True),
+            sa.Column("warning", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        )
+    elif "version" not in {c["name"] for c in inspector.get_columns("sessions")}:
+        op.add_column(
+            "sessions",
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    if "venues" not in existing:
+        op.create_table(
+            "venues",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("session_id", sa.String(), sa.ForeignKey("sessions.id"), nullable=False),
+            sa.Column("google_place_id", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("address", sa.Text(), nullable=True),
+            sa.Column("lat", sa.Float(), nullable=False),
+            sa.Column("lng", sa.Float(), nullable=False),
+            sa.Column("rating", sa.Float(), nullable=False),
+            sa.Column("user_rating_count", sa.Integer(), nullable=False),
+            sa.Column("price_level", sa.String(), nullable=True),
+            sa.Column("google_maps_uri", sa.Text(), nullable=True),
+            sa.Column("types", sa.Text(), nullable=True),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("cuisine_tags", sa.Text(), nullable=True),
+            sa.Column("vibe_tags", sa.Text(), nullable=True),
+            sa.Column("best_for", sa.Text(), nullable=True),
+            sa.Column("signature_dish", sa.Text(), nullable=True),
+            sa.Column("review_sentiment", sa.Text(), nullable=True),
+            sa.Column("standout_dishes", sa.Text(), nullable=True),
+            sa.Column("review_summary", sa.Text(), nullable=True),
+            sa.Column("review_highlights", sa.Text(), nullable=True),
+            sa.Column("editorial_summary", sa.Text(), nullable=True),
+            sa.Column("raw_reviews_cache", sa.Text(), nullable=True),
+        )
+
+    if "votes" not in existing:
+        op.create_table(
+            "votes",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("session_id", sa.String(), sa.ForeignKey("sessions.id"), nullable=False),
+            sa.Column("venue_id", sa.String(), sa.ForeignKey("venues.id"), nullable=False),
+            sa.Column("voter", sa.String(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+        )
+
+    if "snap_cache" not in existing:
+        op.create_table(
+            "snap_cache",
+            sa.Column("cell", sa.String(), primary_key=True),
+            sa.Column("lat", sa.Float(), nullable=False),
+            sa.Column("lng", sa.Float(), nullable=False),
+            sa.Column("address", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+        )
+
+    if "place_search_cache" not in existing:
+        op.create_table(
+            "place_search_cache",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("geohash", sa.String(), nullable=False),
+            sa.Column("radius", sa.Float(), nullable=False),
+            sa.Column("center_lat", sa.Float(), nullable=False),
+            sa.Column("center_lng", sa.Float(), nullable=False),
+            sa.Column("places", sa.Text(), nullable=False),
+            sa.Column("fetched_at", sa.Integer(), nullable=False),
+        )
+        op.create_index("ix_place_search_cache_geohash", "place_search_cache", ["geohash"])
+
+    if "compute_jobs" not in existing:
+        op.create_table(
+            "compute_jobs",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("session_id", sa.String(), sa.ForeignKey("sessions.id"), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+            sa.Column("started_at", sa.Integer(), nullable=True),
+            sa.Column("finished_at", sa.Integer(), nullable=True),
+        )
+        op.create_index("ix_compute_jobs_status", "compute_jobs", ["status"])
+
+    if "llm_cache" not in existing:
+        op.create_table(
+            "llm_cache",
+            sa.Column("key", sa.String(), primary_key=True),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("google_place_id", sa.String(), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+        )
+
+    if "travel_time_cache" not in existing:
+        op.create_table(
+            "travel_time_cache",
+            sa.Column("key", sa.String(), primary_key=True),
+            sa.Column("seconds", sa.Float(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+        )
+
+    if "session_events" not in existing:
+        op.create_table(
+            "session_events",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("session_id", sa.String(), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in (
+        "session_events",
+        "travel_time_cache",
+        "llm_cache",
+        "compute_jobs",
+        "place_search_cache",
+        "snap_cache",
+        "votes",
+        "venues",
+        "sessions",
+    ):
+        op.drop_table(table)
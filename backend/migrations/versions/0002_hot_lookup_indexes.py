@@ -0,0 +1,46 @@
+"""Index hot lookup columns and make votes unique per (session_id, voter)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Drop any duplicate votes left by the old SELECT-then-INSERT race, keeping the earliest
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM votes
+            WHERE EXISTS (
+                SELECT 1 FROM votes AS earlier
+                WHERE earlier.session_id = votes.session_id
+                  AND earlier.voter = votes.voter
+                  AND (earlier.created_at < votes.created_at
+                       OR (earlier.created_at = votes.created_at AND earlier.id < votes.id))
+            )
+            """
+        )
+    )
+
+    op.create_index("ix_venues_session_id", "venues", ["session_id"])
+    # Also serves plain votes.session_id lookups (leftmost column)
+    op.create_index("uq_votes_session_id_voter", "votes", ["session_id", "voter"], unique=True)
+    op.create_index("ix_compute_jobs_session_id", "compute_jobs", ["session_id"])
+    op.create_index("ix_session_events_created_at", "session_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_session_events_created_at", table_name="session_events")
+    op.drop_index("ix_compute_jobs_session_id", table_name="compute_jobs")
+    op.drop_index("uq_votes_session_id_voter", table_name="votes")
+    op.drop_index("ix_venues_session_id", table_name="venues")
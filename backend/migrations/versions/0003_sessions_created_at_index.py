@@ -0,0 +1,22 @@
+"""Index sessions.created_at for the expired-session reaper
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_created_at", "sessions", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_created_at", table_name="sessions")
@@ -0,0 +1,44 @@
+"""Widen epoch-second timestamps to BIGINT
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TIMESTAMP_COLUMNS = {
+    "sessions": [("created_at", False), ("updated_at", False)],
+    "votes": [("created_at", False)],
+    "snap_cache": [("created_at", False)],
+    "place_search_cache": [("fetched_at", False)],
+    "compute_jobs": [("created_at", False), ("started_at", True), ("finished_at", True)],
+    "llm_cache": [("created_at", False)],
+    "travel_time_cache": [("created_at", False)],
+    "session_events": [("created_at", False)],
+}
+
+
+def _retype(type_from: sa.types.TypeEngine, type_to: sa.types.TypeEngine) -> None:
+    # Batch mode: ALTER COLUMN on PostgreSQL, table copy on SQLite
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table) as batch:
+            for column, nullable in columns:
+                batch.alter_column(
+                    column, type_=type_to, existing_type=type_from, existing_nullable=nullable
+                )
+
+
+def upgrade() -> None:
+    _retype(sa.Integer(), sa.BigInteger())
+
+
+def downgrade() -> None:
+    _retype(sa.BigInteger(), sa.Integer())
@@ -0,0 +1,55 @@
+"""Store venue tag and review fields as native JSON (JSONB on PostgreSQL)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+JSON_COLUMNS = (
+    "types",
+    "cuisine_tags",
+    "vibe_tags",
+    "best_for",
+    "review_sentiment",
+    "standout_dishes",
+    "review_highlights",
+    "raw_reviews_cache",
+)
+
+JSON_TYPE = sa.JSON().with_variant(JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    # The Text columns already hold json.dumps output: PostgreSQL casts it,
+    # SQLite keeps the same text under the new declared type
+    with op.batch_alter_table("venues") as batch:
+        for column in JSON_COLUMNS:
+            batch.alter_column(
+                column,
+                type_=JSON_TYPE,
+                existing_type=sa.Text(),
+                existing_nullable=True,
+                postgresql_using=f"{column}::jsonb",
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("venues") as batch:
+        for column in JSON_COLUMNS:
+            batch.alter_column(
+                column,
+                type_=sa.Text(),
+                existing_type=JSON_TYPE,
+                existing_nullable=True,
+                postgresql_using=f"{column}::text",
+            )
@@ -0,0 +1,31 @@
+"""Add rate_limit_counters for the shared rate-limit backend
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("window", sa.BigInteger(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.BigInteger(), nullable=False),
+    )
+    op.create_index("ix_rate_limit_counters_expires_at", "rate_limit_counters", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_counters_expires_at", table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
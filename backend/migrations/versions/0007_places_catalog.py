@@ -0,0 +1,131 @@
+"""Move venue data into a shared places catalog; venues becomes a session join table
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+JSON_TYPE = sa.JSON().with_variant(JSONB(), "postgresql")
+
+# (column, type) moved from venues to places, in table order
+PLACE_COLUMNS = (
+    ("name", sa.String()),
+    ("address", sa.Text()),
+    ("lat", sa.Float()),
+    ("lng", sa.Float()),
+    ("rating", sa.Float()),
+    ("user_rating_count", sa.Integer()),
+    ("price_level", sa.String()),
+    ("google_maps_uri", sa.Text()),
+    ("types", JSON_TYPE),
+    ("editorial_summary", sa.Text()),
+    ("raw_reviews_cache", JSON_TYPE),
+    ("description", sa.Text()),
+    ("cuisine_tags", JSON_TYPE),
+    ("vibe_tags", JSON_TYPE),
+    ("best_for", JSON_TYPE),
+    ("signature_dish", sa.Text()),
+    ("review_sentiment", JSON_TYPE),
+    ("standout_dishes", JSON_TYPE),
+    ("review_summary", sa.Text()),
+    ("review_highlights", JSON_TYPE),
+)
+REQUIRED_COLUMNS = {"name", "lat", "lng", "rating", "user_rating_count"}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "places",
+        sa.Column("google_place_id", sa.String(), primary_key=True),
+        *(
+            sa.Column(name, type_, nullable=name not in REQUIRED_COLUMNS)
+            for name, type_ in PLACE_COLUMNS
+        ),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        sa.Column("intelligence_key", sa.String(), nullable=True),
+    )
+
+    # One catalog row per place, taken from its most recent session. The AI
+    # fields are kept but have no intelligence_key, so they are regenerated
+    # the next time the place comes up.
+    columns = ", ".join(name for name, _ in PLACE_COLUMNS)
+    source_columns = ", ".join(f"v.{name}" for name, _ in PLACE_COLUMNS)
+    op.execute(
+        f"""
+        INSERT INTO places (google_place_id, {columns}, updated_at)
+        SELECT v.google_place_id, {source_columns}, s.created_at
+        FROM venues v JOIN sessions s ON s.id = v.session_id
+        WHERE v.id = (
+            SELECT v2.id FROM venues v2 JOIN sessions s2 ON s2.id = v2.session_id
+            WHERE v2.google_place_id = v.google_place_id
+            ORDER BY s2.created_at DESC, v2.id
+            LIMIT 1
+        )
+        """
+    )
+
+    with op.batch_alter_table("venues") as batch:
+        batch.add_column(sa.Column("rank", sa.Integer(), nullable=False, server_default="0"))
+    # Legacy rows had no stored order; any stable one will do
+    op.execute(
+        """
+        UPDATE venues SET rank = (
+            SELECT COUNT(*) FROM venues v2
+            WHERE v2.session_id = venues.session_id AND v2.id < venues.id
+        )
+        """
+    )
+
+    with op.batch_alter_table("venues") as batch:
+        batch.alter_column("google_place_id", new_column_name="place_id", existing_type=sa.String())
+        batch.alter_column("rank", server_default=None, existing_type=sa.Integer())
+        for name, _ in PLACE_COLUMNS:
+            batch.drop_column(name)
+    # Separate pass: SQLite's batch mode drops a new FK on a column renamed in the same pass
+    with op.batch_alter_table("venues") as batch:
+        batch.create_foreign_key(
+            "fk_venues_place_id_places", "places", ["place_id"], ["google_place_id"]
+        )
+
+    # Superseded by the AI fields stored on the catalog
+    op.drop_table("llm_cache")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "llm_cache",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("google_place_id", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+    )
+
+    with op.batch_alter_table("venues") as batch:
+        batch.drop_constraint("fk_venues_place_id_places", type_="foreignkey")
+        batch.alter_column("place_id", new_column_name="google_place_id", existing_type=sa.String())
+        for name, type_ in PLACE_COLUMNS:
+            batch.add_column(sa.Column(name, type_, nullable=True))
+
+    for name, _ in PLACE_COLUMNS:
+        op.execute(
+            f"UPDATE venues SET {name} = "
+            f"(SELECT p.{name} FROM places p WHERE p.google_place_id = venues.google_place_id)"
+        )
+
+    with op.batch_alter_table("venues") as batch:
+        batch.drop_column("rank")
+        for name in sorted(REQUIRED_COLUMNS):
+            batch.alter_column(name, nullable=False, existing_type=dict(PLACE_COLUMNS)[name])
+
+    op.drop_table("places")
@@ -0,0 +1,25 @@
+"""Record the rank preference of cached Places searches
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing rows were all POPULARITY searches; NULL is read as that
+    op.add_column("place_search_cache", sa.Column("rank_preference", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("place_search_cache") as batch:
+        batch.drop_column("rank_preference")
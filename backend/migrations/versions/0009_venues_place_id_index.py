@@ -0,0 +1,22 @@
+"""Index venues.place_id for finding the sessions that share a place
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_venues_place_id", "venues", ["place_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_venues_place_id", table_name="venues")
@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from "next/server";
+import { clientIpHeaders } from "@/lib/proxy";
 
 const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000";
 
@@ -10,7 +11,10 @@ export async function POST(
     const { id } = await params;
     const res = await fetch(`${BACKEND_URL}/api/sessions/${id}/compute`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: {
+        "Content-Type": "application/json",
+        ...clientIpHeaders(request),
+      },
     });
 
     const data = await res.json();
@@ -0,0 +1,37 @@
+import { NextRequest, NextResponse } from "next/server";
+
+const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000";
+
+export const dynamic = "force-dynamic";
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const res = await fetch(`${BACKEND_URL}/api/sessions/${id}/events`, {
+      cache: "no-store",
+      signal: request.signal,
+    });
+
+    if (!res.ok || !res.body) {
+      const data = await res.json();
+      return NextResponse.json(data, { status: res.status });
+    }
+
+    return new Response(res.body, {
+      headers: {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache, no-transform",
+        Connection: "keep-alive",
+      },
+    });
+  } catch (error) {
+    console.error("API proxy error:", error);
+    return NextResponse.json(
+      { error: "Failed to stream session" },
+      { status: 500 }
+    );
+  }
+}
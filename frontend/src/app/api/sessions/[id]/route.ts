@@ -8,9 +8,24 @@ export async function GET(
 ) {
   try {
     const { id } = await params;
-    const res = await fetch(`${BACKEND_URL}/api/sessions/${id}`);
+    const ifNoneMatch = request.headers.get("if-none-match");
+    const res = await fetch(`${BACKEND_URL}/api/sessions/${id}`, {
+      cache: "no-store",
+      headers: ifNoneMatch ? { "If-None-Match": ifNoneMatch } : undefined,
+    });
+
+    // Pass the ETag through so the browser revalidates with If-None-Match
+    const etag = res.headers.get("etag");
+    const headers: Record<string, string> = etag
+      ? { ETag: etag, "Cache-Control": "no-cache" }
+      : {};
+
+    if (res.status === 304) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
     const data = await res.json();
-    return NextResponse.json(data, { status: res.status });
+    return NextResponse.json(data, { status: res.status, headers });
   } catch (error) {
     console.error("API proxy error:", error);
     return NextResponse.json(
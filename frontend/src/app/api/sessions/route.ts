@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from "next/server";
+import { clientIpHeaders } from "@/lib/proxy";
 
 const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000";
 
@@ -7,7 +8,10 @@ export async function POST(request: NextRequest) {
     const body = await request.json();
     const res = await fetch(`${BACKEND_URL}/api/sessions`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: {
+        "Content-Type": "application/json",
+        ...clientIpHeaders(request),
+      },
       body: JSON.stringify(body),
     });
 
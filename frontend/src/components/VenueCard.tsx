@@ -10,24 +10,6 @@ interface VenueCardProps {
   isWinner?: boolean;
 }
 
-function parseTags(json: string | null): string[] {
-  if (!json) return [];
-  try {
-    return JSON.parse(json);
-  } catch {
-    return [];
-  }
-}
-
-function parseJSON<T>(json: string | null, fallback: T): T {
-  if (!json) return fallback;
-  try {
-    return JSON.parse(json);
-  } catch {
-    return fallback;
-  }
-}
-
 function getPriceLevelDisplay(level: string | null): string {
   switch (level) {
     case "PRICE_LEVEL_INEXPENSIVE":
@@ -50,18 +32,15 @@ export default function VenueCard({
   disabled,
   isWinner,
 }: VenueCardProps) {
-  const cuisineTags = parseTags(venue.cuisineTags);
-  const vibeTags = parseTags(venue.vibeTags);
-  const bestFor = parseTags(venue.bestFor);
+  const cuisineTags = venue.cuisineTags ?? [];
+  const vibeTags = venue.vibeTags ?? [];
+  const bestFor = venue.bestFor ?? [];
   const priceDisplay = getPriceLevelDisplay(venue.priceLevel);
 
-  // Parse review data
-  const reviewSentiment = parseJSON<{positive: number, neutral: number, negative: number}>(
-    venue.reviewSentiment,
-    {positive: 0, neutral: 0, negative: 0}
-  );
-  const standoutDishes = parseJSON<string[]>(venue.standoutDishes, []);
-  const reviewHighlights = parseJSON<string[]>(venue.reviewHighlights, []);
+  // Review data
+  const reviewSentiment = venue.reviewSentiment ?? {positive: 0, neutral: 0, negative: 0};
+  const standoutDishes = venue.standoutDishes ?? [];
+  const reviewHighlights = venue.reviewHighlights ?? [];
   const sentimentScore = reviewSentiment.positive;
 
   return (
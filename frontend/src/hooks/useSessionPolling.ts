@@ -38,20 +38,53 @@ export function useSessionPolling(sessionId: string) {
 
   useEffect(() => {
     let isMounted = true;
-    
+    let interval: ReturnType<typeof setInterval> | null = null;
+    let source: EventSource | null = null;
+
     const fetchWithCheck = async () => {
       if (!isMounted) return;
       await fetchSession();
     };
 
-    fetchWithCheck();
+    // Fall back to fixed-interval polling if the event stream is unavailable
+    const startPolling = () => {
+      if (interval) return;
+      fetchWithCheck();
+      interval = setInterval(fetchWithCheck, POLLING_INTERVAL_MS);
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+    } else {
+      source = new EventSource(`/api/sessions/${sessionId}/events`);
+
+      source.addEventListener("session", (event) => {
+        if (!isMounted) return;
+        const data: SessionWithVenuesAndVotes = JSON.parse(
+          (event as MessageEvent).data
+        );
+        setSession(data);
+        setError(null);
+        setLoading(false);
+
+        if (data.status === "completed") {
+          source?.close();
+        }
+      });
+
+      source.onerror = () => {
+        source?.close();
+        source = null;
+        startPolling();
+      };
+    }
 
-    const interval = setInterval(fetchWithCheck, POLLING_INTERVAL_MS);
     return () => {
       isMounted = false;
-      clearInterval(interval);
+      source?.close();
+      if (interval) clearInterval(interval);
     };
-  }, [fetchSession]);
+  }, [sessionId, fetchSession]);
 
   return { session, error, loading, expired, refetch: fetchSession };
 }
@@ -0,0 +1,17 @@
+import { NextRequest } from "next/server";
+
+// The backend rate-limits by client address, and every proxied request
+// reaches it from this server: pass on who the browser is. Only the
+// rightmost X-Forwarded-For hop, the one the nearest proxy wrote, is kept;
+// anything to its left came from the browser and could be made up. The
+// backend only believes these headers from addresses in
+// RATE_LIMIT_TRUSTED_PROXIES.
+export function clientIpHeaders(request: NextRequest): Record<string, string> {
+  const clientIp =
+    request.headers.get("x-forwarded-for")?.split(",").pop()?.trim() ||
+    request.headers.get("x-real-ip");
+  if (!clientIp) {
+    return {};
+  }
+  return { "X-Forwarded-For": clientIp, "X-Real-IP": clientIp };
+}
@@ -29,6 +29,12 @@ export interface SessionData {
   updatedAt: Date;
 }
 
+export interface ReviewSentiment {
+  positive: number;
+  neutral: number;
+  negative: number;
+}
+
 export interface VenueData {
   id: string;
   sessionId: string;
@@ -41,18 +47,18 @@ export interface VenueData {
   userRatingCount: number;
   priceLevel: string | null;
   googleMapsUri: string | null;
-  types: string | null;
+  types: string[] | null;
   description: string | null;
-  cuisineTags: string | null;
-  vibeTags: string | null;
-  bestFor: string | null;
+  cuisineTags: string[] | null;
+  vibeTags: string[] | null;
+  bestFor: string[] | null;
   signatureDish: string | null;
 
   // Review analysis fields
-  reviewSentiment: string | null;      // JSON: {positive: 0.7, neutral: 0.2, negative: 0.1}
-  standoutDishes: string | null;       // JSON: ["Dish 1", "Dish 2"]
+  reviewSentiment: ReviewSentiment | null;
+  standoutDishes: string[] | null;
   reviewSummary: string | null;        // Plain text
-  reviewHighlights: string | null;     // JSON: ["Highlight 1", "Highlight 2"]
+  reviewHighlights: string[] | null;
   editorialSummary: string | null;     // Plain text from Google
 }
 